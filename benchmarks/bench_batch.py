@@ -0,0 +1,52 @@
+# Batched BFS wavefronts against one A* run per query, for batches whose
+# queries share a few start cells (a service answering many players heading
+# to a handful of goals looks the same).
+# Run from the repository root: python -m benchmarks.bench_batch
+import argparse
+import random
+import time
+
+from pathcore import AStar, NullVisualizer, make_grid
+from pathcore.batch import solve_batch
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[128, 256, 512])
+    parser.add_argument("--density", type=float, default=0.25)
+    parser.add_argument("--pairs", type=int, default=1000)
+    parser.add_argument("--sources", type=int, default=4)
+    parser.add_argument("--astar-sample", type=int, default=50, help="A* queries timed, then scaled to the batch")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'rows':>6} {'pairs':>6} {'batch ms':>9} {'paths ms':>9} {'astar ms':>10} {'speedup':>8} {'mismatch':>8}")
+    for rows in args.sizes:
+        grid = make_grid(rows, density=args.density, seed=args.seed)
+        rng = random.Random(args.seed)
+        open_cells = [cell for cell in range(grid.size) if not grid.barrier[cell]]
+        sources = rng.sample(open_cells, args.sources)
+        pairs = [(rng.choice(sources), rng.choice(open_cells)) for _ in range(args.pairs)]
+
+        t0 = time.perf_counter()
+        lengths, _ = solve_batch(grid, pairs)
+        batch = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        solve_batch(grid, pairs, paths=True)
+        with_paths = time.perf_counter() - t0
+
+        sample = pairs[:args.astar_sample]
+        mismatch = 0
+        t0 = time.perf_counter()
+        for k, (start, end) in enumerate(sample):
+            astar = AStar(grid, start, end, NullVisualizer())
+            astar.solve()
+            expected = astar.path_length if astar.path or start == end else -1
+            mismatch += expected != lengths[k]
+        astar_total = (time.perf_counter() - t0) * len(pairs) / len(sample)
+        print(f"{rows:>6} {len(pairs):>6} {batch * 1000:>9.1f} {with_paths * 1000:>9.1f} {astar_total * 1000:>10.1f} "
+              f"{astar_total / batch:>7.0f}x {mismatch:>8}")
+
+
+if __name__ == "__main__":
+    main()
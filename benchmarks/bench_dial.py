@@ -0,0 +1,38 @@
+# Dial A* on make_grid terrain maps with its bucket queue against the same
+# search on the binary-heap OpenSet. The bucket queue's lead grows with the
+# open set; both must find paths of the same cost.
+# Run from the repository root: python -m benchmarks.bench_dial
+import argparse
+import time
+
+from pathcore import DialAStar, NullVisualizer, make_grid
+
+
+def timed(solver):
+    t0 = time.perf_counter()
+    solver.solve()
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[128, 256, 512, 1024, 2048])
+    parser.add_argument("--density", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'rows':>6} {'expanded':>9} {'peak open':>10} {'heap ms':>9} {'bucket ms':>10} {'speedup':>8} {'cost':>7}")
+    for rows in args.sizes:
+        end = rows * rows - 1
+        grid = make_grid(rows, density=args.density, connect=(0, end), seed=args.seed, terrain=True)
+        heap = DialAStar(grid, 0, end, NullVisualizer(), heap=True)
+        heap_time = timed(heap)
+        bucket = DialAStar(grid, 0, end, NullVisualizer())
+        bucket_time = timed(bucket)
+        assert heap.path_cost == bucket.path_cost, (heap.path_cost, bucket.path_cost)
+        print(f"{rows:>6} {bucket.visited_count:>9} {bucket.peak_open_size:>10} {heap_time * 1000:>9.1f} "
+              f"{bucket_time * 1000:>10.1f} {heap_time / bucket_time:>7.2f}x {bucket.path_cost:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# Whole games, map generation to score, played headless by bots on the
+# fixed-timestep clock across a process pool. Prints throughput and the score
+# spread per bot profile, for tuning calculate_score and load-testing the
+# engine. Every run with the same arguments gives the same scores.
+# Run from the repository root: python -m benchmarks.bench_games
+import argparse
+import time
+
+from pathcore import PathBot, run_games
+
+# name: (mistake_rate, think_ticks)
+PROFILES = {
+    "perfect": (0.0, 0),
+    "hesitant": (0.0, 10),
+    "sloppy": (0.15, 0),
+    "novice": (0.3, 20),
+}
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--games", type=int, default=2000, help="games per profile")
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES), choices=list(PROFILES))
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--density", type=float, default=0.3)
+    parser.add_argument("--algorithm", default="astar")
+    parser.add_argument("--jobs", type=int, default=None, help="pool processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=0, help="first map seed")
+    args = parser.parse_args()
+
+    seeds = range(args.seed, args.seed + args.games)
+    print(f"{'profile':>10} {'games/s':>9} {'score p10':>9} {'p50':>5} {'p90':>5} {'mean':>6} "
+          f"{'moves/opt':>9} {'seconds':>8} {'unfinished':>10}")
+    for name in args.profiles:
+        bot = PathBot(*PROFILES[name], algorithm=args.algorithm)
+        t0 = time.perf_counter()
+        results = run_games(seeds, bot, jobs=args.jobs, rows=args.rows, density=args.density, algorithm=args.algorithm)
+        wall = time.perf_counter() - t0
+        finished = [result for result in results if result["finished"]]
+        scores = [result["score"] for result in finished] or [0]
+        ratio = sum(result["moves"] / result["optimal"] for result in finished) / max(len(finished), 1)
+        seconds = sum(result["seconds"] for result in finished) / max(len(finished), 1)
+        print(f"{name:>10} {len(results) / wall:>9.0f} {percentile(scores, 0.1):>9} {percentile(scores, 0.5):>5} "
+              f"{percentile(scores, 0.9):>5} {sum(scores) / len(scores):>6.1f} {ratio:>9.2f} {seconds:>8.1f} "
+              f"{len(results) - len(finished):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# Abstraction build time and long-range query cost for HPA* against plain A*
+# on seeded make_grid maps, plus the cost of repairing one cluster after an
+# edit.
+# Run from the repository root: python -m benchmarks.bench_hpa
+import argparse
+import random
+import time
+
+from pathcore import AStar, NullVisualizer, make_grid
+from pathcore.hpastar import CLUSTER_SIZE, ClusterGraph, HPAStar
+
+
+def queries(grid, count, seed):
+    # Corner to corner first, then random far-apart open cells.
+    rng = random.Random(seed)
+    pairs = [(0, grid.size - 1)]
+    while len(pairs) < count:
+        start, end = rng.randrange(grid.size), rng.randrange(grid.size)
+        if not grid.barrier[start] and not grid.barrier[end]:
+            pairs.append((start, end))
+    return pairs
+
+
+def timed(solver):
+    t0 = time.perf_counter()
+    solver.solve()
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[256, 512, 1024])
+    parser.add_argument("--density", type=float, default=0.25)
+    parser.add_argument("--cluster-size", type=int, default=CLUSTER_SIZE)
+    parser.add_argument("--queries", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'rows':>6} {'build s':>8} {'nodes':>8} {'astar ms':>9} {'hpa ms':>8} {'astar exp':>10} "
+          f"{'hpa exp':>8} {'length':>7} {'repair ms':>9}")
+    for rows in args.sizes:
+        grid = make_grid(rows, density=args.density, connect=(0, rows * rows - 1), seed=args.seed)
+        t0 = time.perf_counter()
+        graph = ClusterGraph(grid, args.cluster_size)
+        build = time.perf_counter() - t0
+        astar_time = hpa_time = 0.0
+        astar_expanded = hpa_expanded = 0
+        astar_length = hpa_length = 0
+        for start, end in queries(grid, args.queries, args.seed):
+            astar = AStar(grid, start, end, NullVisualizer())
+            astar_time += timed(astar)
+            hpa = HPAStar(grid, start, end, NullVisualizer(), graph=graph)
+            hpa_time += timed(hpa)
+            astar_expanded += astar.visited_count
+            hpa_expanded += hpa.visited_count
+            astar_length += astar.path_length
+            hpa_length += hpa.path_length
+        cell = grid.index(rows // 2, rows // 2)
+        grid.reset(cell) if grid.barrier[cell] else grid.make_barrier(cell)
+        t0 = time.perf_counter()
+        graph.refresh()
+        repair = time.perf_counter() - t0
+        n = args.queries
+        print(f"{rows:>6} {build:>8.2f} {len(graph):>8} {astar_time * 1000 / n:>9.1f} {hpa_time * 1000 / n:>8.1f} "
+              f"{astar_expanded // n:>10} {hpa_expanded // n:>8} {hpa_length / max(astar_length, 1):>7.3f} "
+              f"{repair * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
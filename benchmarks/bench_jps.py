@@ -0,0 +1,55 @@
+# Nodes expanded and wall-clock time for Jump Point Search against plain A*
+# on make_grid maps at several barrier densities.
+# Run from the repository root: python -m benchmarks.bench_jps
+import argparse
+import time
+
+from pathcore import AStar, JumpPointSearch, NullVisualizer, make_grid
+
+
+def build(rows, density, seed):
+    grid = make_grid(rows, density=density, seed=seed)
+    start, end = 0, grid.size - 1
+    grid.reset(start)
+    grid.reset(end)
+    return grid, start, end
+
+
+def run(solver_cls, grid, start, end):
+    solver = solver_cls(grid, start, end, NullVisualizer())
+    t0 = time.perf_counter()
+    solver.solve()
+    return time.perf_counter() - t0, solver.visited_count, solver.path_length
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 500])
+    parser.add_argument("--densities", type=float, nargs="+", default=[0.0, 0.1, 0.2, 0.3, 0.4])
+    parser.add_argument("--seeds", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>6} {'density':>7} {'impl':>16} {'expanded':>10} {'ms':>9} {'solved':>6} {'mismatch':>8}")
+    for rows in args.sizes:
+        for density in args.densities:
+            lengths = {}
+            for solver_cls in (AStar, JumpPointSearch):
+                total_time = 0.0
+                total_visited = 0
+                lengths[solver_cls] = []
+                for seed in range(args.seeds):
+                    grid, start, end = build(rows, density, seed)
+                    elapsed, visited, length = run(solver_cls, grid, start, end)
+                    total_time += elapsed
+                    total_visited += visited
+                    lengths[solver_cls].append(length)
+                solved = sum(length > 0 for length in lengths[solver_cls])
+                mismatch = ""
+                if solver_cls is JumpPointSearch:
+                    mismatch = sum(a != b for a, b in zip(lengths[AStar], lengths[JumpPointSearch]))
+                print(f"{rows:>6} {density:>7.2f} {solver_cls.__name__:>16} {total_visited // args.seeds:>10} "
+                      f"{total_time * 1000 / args.seeds:>9.2f} {solved:>6} {mismatch:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# Compares the heapq open set in AStar against the old queue.PriorityQueue one.
+# Run from the repository root: python -m benchmarks.bench_openset
+import argparse
+import time
+from queue import PriorityQueue
+
+from pathcore import AStar, NullVisualizer, h, make_grid
+from pathcore.grid import INF
+
+
+class PriorityQueueAStar:
+    # The AStar expansion loop as it was before OpenSet, kept for comparison.
+    # It never painted anything, so ``visualizer`` is ignored.
+    def __init__(self, grid, start, end, visualizer=None):
+        self.grid = grid
+        self.start = start
+        self.end = end
+        self.count = 0
+        self.open_set = PriorityQueue()
+        self.open_set.put((0, self.count, start))
+        self.came_from = {}
+        self.g = {start: 0}
+        self.open_set_hash = {start}
+        self.visited_count = 0
+        self.path_length = 0
+
+    def solve(self):
+        grid = self.grid
+        end_pos = grid.pos(self.end)
+        while not self.open_set.empty():
+            current = self.open_set.get()[2]
+            self.open_set_hash.remove(current)
+            if current == self.end:
+                cell = self.end
+                while cell in self.came_from:
+                    self.path_length += 1
+                    cell = self.came_from[cell]
+                return
+            temp_g = self.g[current] + 1
+            for neighbor in grid.neighbors(current):
+                if temp_g < self.g.get(neighbor, INF):
+                    self.came_from[neighbor] = current
+                    self.g[neighbor] = temp_g
+                    f = temp_g + h(grid.pos(neighbor), end_pos)
+                    if neighbor not in self.open_set_hash:
+                        self.count += 1
+                        self.open_set.put((f, self.count, neighbor))
+                        self.open_set_hash.add(neighbor)
+            self.visited_count += 1
+
+
+def build(rows, seed):
+    grid = make_grid(rows, seed=seed)
+    start, end = 0, grid.size - 1
+    grid.reset(start)
+    grid.reset(end)
+    return grid, start, end
+
+
+def run(solver_cls, rows, seed):
+    grid, start, end = build(rows, seed)
+    solver = solver_cls(grid, start, end, NullVisualizer())
+    t0 = time.perf_counter()
+    solver.solve()
+    return time.perf_counter() - t0, solver.visited_count, solver.path_length
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 200, 400])
+    parser.add_argument("--seeds", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'rows':>6} {'impl':>18} {'expanded':>10} {'ms':>9} {'exp/s':>11} {'mismatch':>8}")
+    for rows in args.sizes:
+        results = {}
+        for solver_cls in (PriorityQueueAStar, AStar):
+            total_time = 0.0
+            total_visited = 0
+            lengths = []
+            for seed in range(args.seeds):
+                elapsed, visited, length = run(solver_cls, rows, seed)
+                total_time += elapsed
+                total_visited += visited
+                lengths.append(length)
+            results[solver_cls] = lengths
+            mismatch = ""
+            if solver_cls is AStar:
+                mismatch = sum(a != b for a, b in zip(lengths, results[PriorityQueueAStar]))
+            print(f"{rows:>6} {solver_cls.__name__:>18} {total_visited // args.seeds:>10} "
+                  f"{total_time * 1000 / args.seeds:>9.2f} {total_visited / total_time:>11.0f} {mismatch:>8}")
+
+
+if __name__ == "__main__":
+    main()
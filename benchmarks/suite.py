@@ -0,0 +1,258 @@
+# Reproducible benchmark matrix with a regression gate. Every (solver, size,
+# density) case runs seeded make_grid maps in a process pool and reports
+# query latency percentiles (each query timed --repeats times, best kept),
+# nodes expanded and the solver's peak Python memory. A headless pass times
+# render() and the incremental renderer under SDL's dummy video driver.
+# --save writes the results as a baseline; later runs compare against it and
+# exit non-zero on a regression past --threshold, after timing any slow case
+# a second time.
+# Expansions and path lengths are deterministic and always compared. Times
+# and memory are compared only against a baseline saved on the same machine,
+# and a percentile only when the case has enough samples to be stable.
+# Run from the repository root: python -m benchmarks.suite [--quick] [--save]
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+from pathcore import NullVisualizer, create_solver, make_grid
+from pathcore.grid import random_corridor
+from pathcore.hpastar import ClusterGraph
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+SIZES = [50, 256, 1024, 4096]
+DENSITIES = [0.1, 0.2, 0.3, 0.4]
+SOLVERS = ["astar", "jps", "bidirectional", "hpa"]
+QUICK = {"sizes": [50, 256], "densities": [0.1, 0.3], "frames": 30}  # cases of the full matrix, so one baseline serves both
+THRESHOLD = 0.25  # allowed relative slowdown before a case counts as a regression
+QUICK_THRESHOLD = 1.0  # --quick runs few samples, so only gross slowdowns count
+REPEATS = 5  # timings per query; the fastest is kept
+DETERMINISTIC = ("expansions", "path_length")
+MEASURED = ("p50_ms", "p90_ms", "peak_kib")
+MIN_SAMPLES = {"p50_ms": 10, "p90_ms": 20}  # samples a case needs before its percentile is compared
+MIN_SLOWDOWN_MS = 1.0  # smaller timing changes are scheduler noise, whatever their ratio
+
+
+def machine():
+    return f"{platform.node()}/{platform.machine()}/{platform.python_version()}"
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+def build(rows, density, seed, queries):
+    # A seeded map with a barrier-free corridor between opposite corners.
+    # Queries run corner to corner first, then between random corridor cells,
+    # so every query has a path.
+    rng = random.Random(seed)
+    grid = make_grid(rows, density=density, seed=seed)
+    corridor = random_corridor(grid, 0, grid.size - 1, rng=rng)
+    for cell in corridor:
+        if grid.barrier[cell]:
+            grid.reset(cell)
+    pairs = [(0, grid.size - 1)]
+    while len(pairs) < queries:
+        pairs.append(tuple(rng.sample(corridor, 2)))
+    return grid, pairs
+
+
+def run_case(case):
+    # One (solver, size, density, seed) cell of the matrix, in a pool worker.
+    name, rows, density, seed, queries, repeats = case
+    grid, pairs = build(rows, density, seed, queries)
+    if name == "hpa":
+        ClusterGraph.for_grid(grid)  # built once per map, like a long-lived server would
+    create_solver(name, grid, *pairs[0], NullVisualizer()).solve()  # warm-up
+    # Repeats go round the whole query list rather than back to back, so a
+    # burst of interference from elsewhere on the machine hits one timing of
+    # a query, not all of them.
+    latencies = [None] * len(pairs)
+    for _ in range(repeats):
+        expansions = 0
+        path_length = 0
+        for k, (start, end) in enumerate(pairs):
+            t0 = time.perf_counter()
+            solver = create_solver(name, grid, start, end, NullVisualizer())
+            solver.solve()
+            elapsed = time.perf_counter() - t0
+            latencies[k] = elapsed if latencies[k] is None else min(latencies[k], elapsed)
+            expansions += solver.visited_count
+            path_length += solver.path_length
+    tracemalloc.start()
+    create_solver(name, grid, *pairs[0], NullVisualizer()).solve()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"latencies": latencies, "expansions": expansions, "path_length": path_length, "peak": peak}
+
+
+def solver_matrix(args, keys=None):
+    # ``keys`` limits the run to those cases.
+    cases = [(name, rows, density, seed, args.queries, args.repeats)
+             for rows in args.sizes for density in args.densities
+             for name in args.solvers for seed in range(args.seeds)
+             if keys is None or f"{name}/{rows}/{density}" in keys]
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(args.jobs) as pool:
+        outputs = list(pool.map(run_case, cases))
+    wall = time.perf_counter() - t0
+    grouped = {}
+    for (name, rows, density, *_), output in zip(cases, outputs):
+        grouped.setdefault(f"{name}/{rows}/{density}", []).append(output)
+    results = {}
+    for key, runs in grouped.items():
+        latencies = [latency for run in runs for latency in run["latencies"]]
+        results[key] = {
+            "queries": len(latencies),
+            "samples": len(latencies),
+            "p50_ms": percentile(latencies, 0.5) * 1000,
+            "p90_ms": percentile(latencies, 0.9) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+            "expansions": sum(run["expansions"] for run in runs),
+            "path_length": sum(run["path_length"] for run in runs),
+            "peak_kib": max(run["peak"] for run in runs) / 1024,
+        }
+    queries = sum(result["queries"] for result in results.values())
+    print(f"{'case':>26} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'expanded':>10} {'peak KiB':>9}")
+    for key, result in results.items():
+        print(f"{key:>26} {result['p50_ms']:>9.2f} {result['p90_ms']:>9.2f} {result['p99_ms']:>9.2f} "
+              f"{result['expansions'] // result['queries']:>10} {result['peak_kib']:>9.0f}")
+    print(f"{queries} queries in {wall:.1f}s on {args.jobs or os.cpu_count()} processes: {queries / wall:.1f} queries/s")
+    return results
+
+
+def render_benchmark(args):
+    # render() and render_incremental() per frame on a board part-way through
+    # a replayed A* search; maps too big to show cell by cell take the
+    # overview path.
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    import pathfinding as game
+    from pathcore import SearchTrace, TracePlayer
+
+    results = {}
+    print(f"{'case':>26} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9}")
+    for rows in args.render_sizes:
+        grid, pairs = build(rows, 0.25, 0, 1)
+        start, end = pairs[0]
+        grid.make_start(start)
+        grid.make_end(end)
+        trace = SearchTrace()
+        create_solver("astar", grid, start, end, trace).solve()
+        camera = game.Camera(grid)
+        player = game.Player(grid, start)
+        ui = game.UI()
+        for mode in ("full", "incremental"):
+            grid.clear_search()
+            playback = TracePlayer(trace, grid, max(len(trace.expansions) // (2 * args.frames), 1))
+            renderer = game.make_renderer(grid, camera) if mode == "incremental" else game.FadeTracker(grid)
+            times = []
+            for _ in range(args.frames):
+                playback.step()
+                t0 = time.perf_counter()
+                if mode == "incremental":
+                    game.render_incremental(game.WIN, game.GAME_STATES['RUNNING_ASTAR'], renderer, player, playback, ui, "", 0)
+                else:
+                    game.render(game.WIN, game.GAME_STATES['RUNNING_ASTAR'], grid, renderer, camera, player, playback, ui, "", 0)
+                times.append(time.perf_counter() - t0)
+            key = f"render/{mode}/{rows}"
+            results[key] = {name: percentile(times, q) * 1000 for name, q in (("p50_ms", 0.5), ("p90_ms", 0.9), ("p99_ms", 0.99))}
+            results[key]["samples"] = len(times)
+            print(f"{key:>26} {results[key]['p50_ms']:>9.2f} {results[key]['p90_ms']:>9.2f} {results[key]['p99_ms']:>9.2f}")
+    return results
+
+
+def compare(results, baseline, threshold):
+    # Regressions as (case, metric, baseline value, new value), and how many
+    # cases could be compared at all.
+    metrics = DETERMINISTIC + MEASURED if baseline.get("machine") == machine() else DETERMINISTIC
+    regressions = []
+    compared = 0
+    for key, result in results.items():
+        old = baseline["results"].get(key)
+        if old is None or result.get("queries") != old.get("queries"):
+            continue  # not in the baseline, or run with another number of queries
+        compared += 1
+        for metric in metrics:
+            if metric not in result or metric not in old:
+                continue
+            if metric in DETERMINISTIC:
+                regressed = result[metric] != old[metric]
+            elif min(result.get("samples", 0), old.get("samples", 0)) < MIN_SAMPLES.get(metric, 0):
+                continue
+            else:
+                regressed = result[metric] > old[metric] * (1 + threshold)
+                if metric.endswith("_ms"):
+                    regressed = regressed and result[metric] - old[metric] > MIN_SLOWDOWN_MS
+            if regressed:
+                regressions.append((key, metric, old[metric], result[metric]))
+    return regressions, compared
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--densities", type=float, nargs="+", default=DENSITIES)
+    parser.add_argument("--solvers", nargs="+", default=SOLVERS)
+    parser.add_argument("--seeds", type=int, default=2)
+    parser.add_argument("--queries", type=int, default=10, help="queries per map")
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="timings per query; the fastest is kept")
+    parser.add_argument("--jobs", type=int, default=None, help="pool processes (default: one per CPU)")
+    parser.add_argument("--render-sizes", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--frames", type=int, default=120, help="frames timed per render case")
+    parser.add_argument("--no-render", action="store_true")
+    parser.add_argument("--quick", action="store_true", help="small matrix for a fast check")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help=f"allowed relative slowdown (default {THRESHOLD}, {QUICK_THRESHOLD} with --quick)")
+    args = parser.parse_args()
+    if args.quick:
+        for name, value in QUICK.items():
+            setattr(args, name, value)
+    if args.threshold is None:
+        args.threshold = QUICK_THRESHOLD if args.quick else THRESHOLD
+
+    results = solver_matrix(args)
+    if not args.no_render:
+        results.update(render_benchmark(args))
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump({"machine": machine(), "results": results}, f, indent=1, sort_keys=True)
+        print(f"baseline saved to {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        sys.exit(f"no baseline at {args.baseline}; run with --save to create one")
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("machine") != machine():
+        print(f"baseline is from {baseline.get('machine')}; comparing deterministic counts only")
+    regressions, compared = compare(results, baseline, args.threshold)
+    if not compared:
+        sys.exit(f"no case of this run matches one in {args.baseline}; nothing was compared")
+    print(f"{compared} of {len(results)} cases compared against {args.baseline}")
+    # A slow solver case is timed again and keeps its faster run, so one burst
+    # of load on the machine does not fail the gate on its own.
+    retry = {key for key, metric, _, _ in regressions if metric.endswith("_ms") and not key.startswith("render/")}
+    if retry:
+        print(f"re-timing {len(retry)} slow case(s)")
+        for key, result in solver_matrix(args, retry).items():
+            for metric in ("p50_ms", "p90_ms", "p99_ms"):
+                results[key][metric] = min(results[key][metric], result[metric])
+        regressions, _ = compare(results, baseline, args.threshold)
+    for key, metric, old, new in regressions:
+        print(f"REGRESSION {key} {metric}: {old:.6g} -> {new:.6g}")
+    if regressions:
+        sys.exit(1)
+    print("no regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+from .astar import AStar, WeightedAStar, WEIGHTED_ASTAR_WEIGHT
+from .batch import distance_fields, solve_batch
+from .bfs import BreadthFirstSearch
+from .bidirectional import BidirectionalAStar
+from .components import ComponentIndex
+from .dial import DialAStar
+from .openset import BucketQueue, OpenSet
+from .pathcache import PathCache
+from .grid import Grid, CellState, make_grid, BARRIER_DENSITY, GRASS, MUD, ROAD, WATER
+from .heuristics import h
+from .hpastar import ClusterGraph, HPAStar
+from .jps import JumpPointSearch
+from .lpastar import LPAStar
+from .mapfile import MapFile, load_grid, save_grid
+from .mapgen import GENERATORS, generate_grid, grid_from_mask
+from .metrics import FrameProfiler
+from .scoring import calculate_score
+from .sim import FixedClock, Game, PathBot, ScriptedBot, play_game, run_games
+from .solver import SOLVERS, Solver, create_solver, register_solver, solve, solver_names
+from .trace import GridPainter, NullVisualizer, SearchTrace, TracePlayer
+from .worker import SearchJob, SearchWorker
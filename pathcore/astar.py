@@ -0,0 +1,80 @@
+from .grid import INF
+from .heuristics import h
+from .openset import OpenSet
+from .solver import Solver, register_solver
+
+WEIGHTED_ASTAR_WEIGHT = 1.5
+
+
+@register_solver("astar")
+class AStar(Solver):
+    # Expands one node per step() with no pacing of its own; animation is the
+    # caller's job (see TracePlayer). Open/closed/path events go to
+    # ``visualizer``, which paints the grid by default. Every step costs 1
+    # unless ``costs`` holds a cost per cell to step onto.
+    label = "A*"
+    weight = 1
+
+    def __init__(self, grid, start, end, visualizer=None):
+        super().__init__(grid, start, end, visualizer)
+        self.costs = None
+        self.open_set = self.make_open_set()
+        grid.reset_search()
+        grid.g[start] = 0
+        self.open_set.push(start, self.weight * h(grid.pos(start), grid.pos(end)))
+
+    def make_open_set(self):
+        return OpenSet()
+
+    def step(self):
+        if self.done or self.open_set.empty():
+            self.done = True
+            return
+
+        current = self.open_set.pop()
+
+        if current == self.end:
+            self.finish(self.reconstruct_path())
+            return
+
+        grid = self.grid
+        g = grid.g
+        costs = self.costs
+        parent = grid.parent
+        open_set = self.open_set
+        visualizer = self.visualizer
+        weight = self.weight
+        cols = grid.cols
+        end_row, end_col = divmod(self.end, cols)
+        g_current = g[current]
+        temp_g = g_current + 1
+        for neighbor in grid.neighbors(current):
+            if costs is not None:
+                temp_g = g_current + costs[neighbor]
+            if temp_g < g[neighbor]:
+                was_open = neighbor in open_set
+                if not was_open and g[neighbor] != INF:
+                    self.reopened += 1
+                parent[neighbor] = current
+                g[neighbor] = temp_g
+                row, col = divmod(neighbor, cols)
+                open_set.push(neighbor, temp_g + weight * (abs(row - end_row) + abs(col - end_col)))
+                if not was_open:
+                    visualizer.open(neighbor)
+
+        visualizer.close(current)
+        if current != self.start:
+            self.visited_count += 1
+
+
+@register_solver("weighted")
+class WeightedAStar(AStar):
+    # f = g + weight * h: paths are at most ``weight`` times optimal, found
+    # with far fewer expansions on open maps.
+    label = "Weighted A*"
+
+    def __init__(self, grid, start, end, visualizer=None, weight=WEIGHTED_ASTAR_WEIGHT):
+        if weight < 1:
+            raise ValueError("weighted A* needs weight >= 1")
+        self.weight = weight
+        super().__init__(grid, start, end, visualizer)
@@ -0,0 +1,124 @@
+# Many queries against one map at once. Every move costs 1, so one
+# breadth-first distance field answers every query that shares its source, and
+# because moves are symmetric, a field from an end cell answers every query
+# that ends there too. solve_batch grows fields from whichever side of the
+# batch has fewer distinct cells. It advances a stack of boolean frontiers
+# together with array shifts against the barrier mask, and stops once every
+# query in the chunk has its answer.
+from .mapgen import _require_numpy
+
+MAX_BATCH_CELLS = 2 ** 24  # fields x cells advanced together per chunk
+
+
+def _passable(grid):
+    np = _require_numpy()
+    return np.frombuffer(bytes(grid.barrier), dtype=np.uint8).reshape(grid.rows, grid.cols) == 0
+
+
+def _grow(frontier, passable, seen):
+    np = _require_numpy()
+    grown = np.zeros_like(frontier)
+    grown[:, 1:, :] |= frontier[:, :-1, :]
+    grown[:, :-1, :] |= frontier[:, 1:, :]
+    grown[:, :, 1:] |= frontier[:, :, :-1]
+    grown[:, :, :-1] |= frontier[:, :, 1:]
+    grown &= passable
+    grown &= ~seen
+    return grown
+
+
+def distance_fields(grid, sources):
+    # (len(sources), rows, cols) int32 BFS distances; -1 where unreachable,
+    # and everywhere for a source that is a barrier.
+    np = _require_numpy()
+    sources = np.asarray(sources, dtype=np.int64)
+    passable = _passable(grid)
+    rows, cols = passable.shape
+    fields = np.full((len(sources), rows, cols), -1, dtype=np.int32)
+    frontier = np.zeros(fields.shape, dtype=bool)
+    frontier[np.arange(len(sources)), sources // cols, sources % cols] = passable.flat[sources]
+    seen = frontier.copy()
+    fields[frontier] = 0
+    distance = 0
+    while frontier.any():
+        distance += 1
+        frontier = _grow(frontier, passable, seen)
+        seen |= frontier
+        fields[frontier] = distance
+    return fields
+
+
+def _descend(grid, field, cell):
+    # Cells from ``cell`` down a distance field to its source, excluding
+    # ``cell``: each step moves to a neighbour one closer. None if the walk
+    # gets stuck, which a field grown from a passable source never does.
+    cells = []
+    distance = field[cell]
+    while distance > 0:
+        distance -= 1
+        cell = next((n for n in grid.neighbors(cell) if field[n] == distance), None)
+        if cell is None:
+            return None
+        cells.append(cell)
+    return cells
+
+
+def solve_batch(grid, pairs, paths=False, max_cells=MAX_BATCH_CELLS):
+    # ``pairs`` is an (n, 2) array-like of (start, end) cell indices. Returns
+    # (lengths, paths): lengths is an int32 array with -1 for "no path", and
+    # paths is a list of cell lists in the Solver.path convention (start
+    # excluded, end included) when ``paths`` is set, else None. Pairs with a
+    # barrier at either end have no path.
+    np = _require_numpy()
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    passable = _passable(grid)
+    rows, cols = passable.shape
+    lengths = np.full(len(pairs), -1, dtype=np.int32)
+    found = [[] for _ in range(len(pairs))] if paths else None
+    valid = np.nonzero(passable.flat[pairs[:, 0]] & passable.flat[pairs[:, 1]])[0]
+    starts, ends = pairs[valid, 0], pairs[valid, 1]
+    from_ends = len(np.unique(ends)) <= len(np.unique(starts))
+    sources, lookups = (ends, starts) if from_ends else (starts, ends)
+    unique, owner = np.unique(sources, return_inverse=True)
+    owner = owner.reshape(-1)
+    chunk = max(1, max_cells // (rows * cols))
+    for first in range(0, len(unique), chunk):
+        chunk_sources = unique[first:first + chunk]
+        local = np.nonzero((owner >= first) & (owner < first + len(chunk_sources)))[0]
+        queries = valid[local]
+        field_of = owner[local] - first
+        targets = lookups[local]
+        target_rows, target_cols = targets // cols, targets % cols
+        frontier = np.zeros((len(chunk_sources), rows, cols), dtype=bool)
+        frontier[np.arange(len(chunk_sources)), chunk_sources // cols, chunk_sources % cols] = True
+        seen = frontier.copy()
+        fields = np.full(frontier.shape, -1, dtype=np.int32) if paths else None
+        if paths:
+            fields[frontier] = 0
+        pending = np.ones(len(queries), dtype=bool)
+        distance = 0
+        hit = frontier[field_of, target_rows, target_cols]
+        lengths[queries[hit]] = 0
+        pending &= ~hit
+        while pending.any() and frontier.any():
+            distance += 1
+            frontier = _grow(frontier, passable, seen)
+            seen |= frontier
+            if paths:
+                fields[frontier] = distance
+            hit = pending & frontier[field_of, target_rows, target_cols]
+            lengths[queries[hit]] = distance
+            pending &= ~hit
+        if paths:
+            flat = fields.reshape(len(chunk_sources), -1)
+            for query, field, target in zip(queries, field_of, targets):
+                if lengths[query] < 0:
+                    continue
+                cells = _descend(grid, flat[field], int(target))
+                if cells is None:
+                    lengths[query] = -1
+                elif from_ends:
+                    found[query] = cells
+                elif cells:
+                    found[query] = [*reversed(cells[:-1]), int(target)]
+    return lengths, found
@@ -0,0 +1,48 @@
+from collections import deque
+
+from .solver import Solver, register_solver
+
+
+@register_solver("bfs")
+class BreadthFirstSearch(Solver):
+    # Exact on the unit-cost grid with no heuristic and no heap; the reference
+    # answer when checking the other solvers.
+    label = "BFS"
+
+    def __init__(self, grid, start, end, visualizer=None):
+        super().__init__(grid, start, end, visualizer)
+        self.queue = deque([start])
+        self._peak_open = 1
+        grid.reset_search()
+        grid.g[start] = 0
+
+    @property
+    def peak_open_size(self):
+        return self._peak_open
+
+    def step(self):
+        if self.done or not self.queue:
+            self.done = True
+            return
+
+        current = self.queue.popleft()
+
+        if current == self.end:
+            self.finish(self.reconstruct_path())
+            return
+
+        grid = self.grid
+        g = grid.g
+        temp_g = g[current] + 1
+        for neighbor in grid.neighbors(current):
+            if g[neighbor] > temp_g:
+                g[neighbor] = temp_g
+                grid.parent[neighbor] = current
+                self.queue.append(neighbor)
+                self.visualizer.open(neighbor)
+        if len(self.queue) > self._peak_open:
+            self._peak_open = len(self.queue)
+
+        self.visualizer.close(current)
+        if current != self.start:
+            self.visited_count += 1
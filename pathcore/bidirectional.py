@@ -0,0 +1,94 @@
+from array import array
+
+from .grid import INF
+from .heuristics import h
+from .openset import OpenSet
+from .solver import Solver, register_solver
+
+
+@register_solver("bidirectional")
+class BidirectionalAStar(Solver):
+    # Two A* frontiers, start -> end and end -> start, each step expanding the
+    # smaller one. The forward search keeps its scores in grid.g/parent; the
+    # backward one has its own arrays. Stops once the best meeting cost ``mu``
+    # can no longer be beaten: mu <= max(min f forward, min f backward).
+    label = "Bidirectional A*"
+
+    def __init__(self, grid, start, end, visualizer=None):
+        super().__init__(grid, start, end, visualizer)
+        grid.reset_search()
+        grid.g[start] = 0
+        self.g_back = array("i", [INF]) * grid.size
+        self.parent_back = array("i", [-1]) * grid.size
+        self.g_back[end] = 0
+        self.forward = OpenSet()
+        self.backward = OpenSet()
+        self.forward.push(start, h(grid.pos(start), grid.pos(end)))
+        self.backward.push(end, h(grid.pos(end), grid.pos(start)))
+        self.mu = INF
+        self.meet = -1
+        if start == end:
+            self.mu, self.meet = 0, start
+
+    @property
+    def peak_open_size(self):
+        return self.forward.peak_size + self.backward.peak_size
+
+    @property
+    def open_sets(self):
+        return self.forward, self.backward
+
+    def _expand(self, open_set, g, parent, other_g, target):
+        grid = self.grid
+        current = open_set.pop()
+        cols = grid.cols
+        target_row, target_col = divmod(target, cols)
+        temp_g = g[current] + 1
+        for neighbor in grid.neighbors(current):
+            if temp_g < g[neighbor]:
+                was_open = neighbor in open_set
+                if not was_open and g[neighbor] != INF:
+                    self.reopened += 1
+                parent[neighbor] = current
+                g[neighbor] = temp_g
+                row, col = divmod(neighbor, cols)
+                open_set.push(neighbor, temp_g + abs(row - target_row) + abs(col - target_col))
+                if not was_open:
+                    self.visualizer.open(neighbor)
+                if other_g[neighbor] != INF and temp_g + other_g[neighbor] < self.mu:
+                    self.mu = temp_g + other_g[neighbor]
+                    self.meet = neighbor
+        self.visualizer.close(current)
+        if current != self.start and current != self.end:
+            self.visited_count += 1
+
+    def step(self):
+        if self.done:
+            return
+        forward, backward = self.forward, self.backward
+        if self.mu != INF and (forward.empty() or backward.empty()
+                               or self.mu <= max(forward.min_priority(), backward.min_priority())):
+            self.finish(self.reconstruct_path())
+            return
+        if forward.empty() or backward.empty():
+            self.done = True
+            return
+        grid = self.grid
+        if len(forward) <= len(backward):
+            self._expand(forward, grid.g, grid.parent, self.g_back, self.end)
+        else:
+            self._expand(backward, self.g_back, self.parent_back, grid.g, self.start)
+
+    def reconstruct_path(self):
+        path = []
+        parent = self.grid.parent
+        current = self.meet
+        while current != self.start:
+            path.append(current)
+            current = parent[current]
+        path.reverse()
+        current = self.meet
+        while current != self.end:
+            current = self.parent_back[current]
+            path.append(current)
+        return path
@@ -0,0 +1,136 @@
+from array import array
+from collections import deque
+
+
+class ComponentIndex:
+    # Connected-component labels for the passable cells of a grid, kept up to
+    # date through grid.listeners. reachable() is a label comparison, so a
+    # query with no path is rejected before any search runs.
+    #
+    # Opening a cell merges the components around it by relabelling the
+    # smaller ones. Closing a cell may split its component: flood fills from
+    # each side run in lockstep and stop as soon as they meet, so the cost is
+    # bounded by the smaller piece that broke off.
+    def __init__(self, grid):
+        self.grid = grid
+        self.labels = array("i", [-1]) * grid.size
+        self.sizes = {}
+        self.next_label = 0
+        for cell in range(grid.size):
+            if not grid.barrier[cell] and self.labels[cell] == -1:
+                self.sizes[self.next_label] = self._fill(cell, self.next_label)
+                self.next_label += 1
+        grid.listeners.append(self.on_toggle)
+
+    def detach(self):
+        if self.on_toggle in self.grid.listeners:
+            self.grid.listeners.remove(self.on_toggle)
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def label(self, cell):
+        return self.labels[cell]
+
+    def component_size(self, cell):
+        return self.sizes.get(self.labels[cell], 0)
+
+    def reachable(self, start, end):
+        label = self.labels[start]
+        return label != -1 and label == self.labels[end]
+
+    def _fill(self, seed, label):
+        labels = self.labels
+        neighbors = self.grid.neighbors
+        labels[seed] = label
+        queue = deque([seed])
+        count = 0
+        while queue:
+            cell = queue.popleft()
+            count += 1
+            for neighbor in neighbors(cell):
+                if labels[neighbor] != label:
+                    labels[neighbor] = label
+                    queue.append(neighbor)
+        return count
+
+    def on_toggle(self, cell):
+        if self.grid.barrier[cell]:
+            self._close(cell)
+        else:
+            self._open(cell)
+
+    def _new_label(self):
+        label = self.next_label
+        self.next_label += 1
+        return label
+
+    def _open(self, cell):
+        neighbors = self.grid.neighbors(cell)
+        around = {self.labels[n] for n in neighbors}
+        if not around:
+            label = self._new_label()
+            self.labels[cell] = label
+            self.sizes[label] = 1
+            return
+        target = max(around, key=self.sizes.__getitem__)
+        self.labels[cell] = target
+        self.sizes[target] += 1
+        for label in around - {target}:
+            seed = next(n for n in neighbors if self.labels[n] == label)
+            self.sizes[target] += self._fill(seed, target)
+            del self.sizes[label]
+
+    def _close(self, cell):
+        label = self.labels[cell]
+        self.labels[cell] = -1
+        self.sizes[label] -= 1
+        if not self.sizes[label]:
+            del self.sizes[label]
+            return
+        seeds = self.grid.neighbors(cell)
+        if len(seeds) < 2:
+            return
+        neighbors = self.grid.neighbors
+        owner = {seed: i for i, seed in enumerate(seeds)}
+        queues = [deque([seed]) for seed in seeds]
+        visited = [[seed] for seed in seeds]
+        group = list(range(len(seeds)))
+
+        def find(i):
+            while group[i] != i:
+                group[i] = group[group[i]]
+                i = group[i]
+            return i
+
+        active = set(group)
+        while len(active) > 1:
+            for i, queue in enumerate(queues):
+                if not queue:
+                    continue
+                current = queue.popleft()
+                for neighbor in neighbors(current):
+                    other = owner.get(neighbor)
+                    if other is None:
+                        owner[neighbor] = i
+                        queue.append(neighbor)
+                        visited[i].append(neighbor)
+                    elif find(other) != find(i):
+                        absorbed = find(other)
+                        group[absorbed] = find(i)
+                        active.discard(absorbed)
+                if len(active) == 1:
+                    return
+            for root in list(active):
+                members = [i for i in range(len(seeds)) if find(i) == root]
+                if len(active) > 1 and not any(queues[i] for i in members):
+                    # This side ran out of cells without meeting the others.
+                    split = self._new_label()
+                    count = 0
+                    for i in members:
+                        for c in visited[i]:
+                            self.labels[c] = split
+                        count += len(visited[i])
+                    self.sizes[split] = count
+                    self.sizes[label] -= count
+                    active.discard(root)
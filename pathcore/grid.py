@@ -0,0 +1,239 @@
+import random
+from array import array
+from enum import IntEnum
+
+BARRIER_DENSITY = 0.3
+INF = 2 ** 31 - 1
+# Terrain costs: stepping onto a cell costs its value. Grids without terrain
+# cost 1 everywhere; make_grid(terrain=True) lays grass and cheaper roads,
+# with mud and water patches.
+ROAD, GRASS, MUD, WATER = 1, 2, 4, 8
+TERRAIN_SHARES = ((MUD, 0.1), (WATER, 0.05))  # rough share of the map in each kind of patch
+
+
+class CellState(IntEnum):
+    EMPTY = 0
+    BARRIER = 1
+    START = 2
+    END = 3
+    OPEN = 4
+    CLOSED = 5
+    PATH = 6
+
+
+SEARCH_STATES = (CellState.OPEN, CellState.CLOSED, CellState.PATH)
+_CLEAR_SEARCH = bytes(CellState.EMPTY if i in SEARCH_STATES else i for i in range(256))
+_PAINTABLE = bytes(i == CellState.EMPTY or i in SEARCH_STATES for i in range(256))
+_LOAD_STATE = bytes(CellState.BARRIER if i else CellState.EMPTY for i in range(256))
+_FLIP = bytes(not i for i in range(256))
+
+# Adjacency bits: which of a cell's four neighbours are on the board and
+# passable, in the same down/up/right/left order the solvers expand them.
+DOWN, UP, RIGHT, LEFT = 1, 2, 4, 8
+DIRECTIONS = ((DOWN, 1, 0, UP), (UP, -1, 0, DOWN), (RIGHT, 0, 1, LEFT), (LEFT, 0, -1, RIGHT))
+
+
+def open_adjacency(rows, cols):
+    # Adjacency of an empty board, built row-pattern-wise rather than per cell.
+    row = bytearray(DOWN | UP | RIGHT | LEFT for _ in range(cols))
+    row[0] &= ~LEFT
+    row[-1] &= ~RIGHT
+    if rows == 1:
+        return bytearray(bytes(row).translate(bytes(i & ~(UP | DOWN) for i in range(256))))
+    first = bytes(row).translate(bytes(i & ~UP for i in range(256)))
+    last = bytes(row).translate(bytes(i & ~DOWN for i in range(256)))
+    return bytearray(first + bytes(row) * (rows - 2) + last)
+
+
+class Grid:
+    # Struct-of-arrays board: every per-cell field is a flat array indexed by
+    # row * cols + col, so a cell costs a few bytes instead of a Python object.
+    def __init__(self, rows, cols=None):
+        self.rows = rows
+        self.cols = rows if cols is None else cols
+        self.size = self.rows * self.cols
+        self.state = bytearray(self.size)
+        self.barrier = bytearray(self.size)
+        self.g = array("i", [INF]) * self.size
+        self.parent = array("i", [-1]) * self.size
+        self.adjacency = open_adjacency(self.rows, self.cols)
+        self.cost = bytearray(b"\x01") * self.size
+        self.min_cost = self.max_cost = 1
+        self._offsets = [tuple(dr * self.cols + dc for bit, dr, dc, _ in DIRECTIONS if bits & bit)
+                         for bits in range(16)]
+        # Bumped whenever a cell becomes or stops being a barrier; listeners
+        # are called with the index of that cell.
+        self.version = 0
+        self.listeners = []
+        # Set of indices whose state changed since the consumer last drained it;
+        # None keeps change tracking off.
+        self.changed = None
+        # Cells mark() painted while tracking was on, so clear_search() can
+        # report them without scanning the board.
+        self.painted = set()
+
+    def index(self, row, col):
+        return row * self.cols + col
+
+    def pos(self, index):
+        return divmod(index, self.cols)
+
+    def in_bounds(self, row, col):
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def get_state(self, index):
+        return CellState(self.state[index])
+
+    def set_state(self, index, state):
+        self.state[index] = state
+        blocked = state == CellState.BARRIER
+        if self.barrier[index] != blocked:
+            self.barrier[index] = blocked
+            self._update_adjacency(index, blocked)
+            self.version += 1
+            for listener in self.listeners:
+                listener(index)
+        if self.changed is not None:
+            self.changed.add(index)
+
+    def _update_adjacency(self, index, blocked):
+        # Only the four cells around a toggled cell change their adjacency.
+        row, col = divmod(index, self.cols)
+        adjacency = self.adjacency
+        for bit, dr, dc, opposite in DIRECTIONS:
+            if 0 <= row + dr < self.rows and 0 <= col + dc < self.cols:
+                neighbor = index + dr * self.cols + dc
+                if blocked:
+                    adjacency[neighbor] &= ~opposite
+                else:
+                    adjacency[neighbor] |= opposite
+
+    def load_barriers(self, barrier):
+        # Replace the whole barrier layer (0/1 bytes) in one go. Adjacency is
+        # rebuilt with big-integer shifts over the byte layers, one byte per
+        # cell, instead of toggling cells one at a time. Meant for freshly
+        # built grids: listeners are not told about individual cells.
+        self.barrier[:] = bytes(barrier).translate(_LOAD_STATE)
+        self.state[:] = self.barrier
+        passable = int.from_bytes(self.barrier.translate(_FLIP), "little")
+        shift = 8 * self.cols
+        around = (DOWN * (passable >> shift) | UP * (passable << shift)
+                  | RIGHT * (passable >> 8) | LEFT * (passable << 8))
+        adjacency = int.from_bytes(open_adjacency(self.rows, self.cols), "little") & around
+        self.adjacency[:] = adjacency.to_bytes(self.size, "little")
+        self.version += 1
+
+    def load_costs(self, costs):
+        # Replace the terrain cost layer (one byte per cell, 1-255). Solvers
+        # that read costs size their heuristic and queue from min_cost and
+        # max_cost. Bumps ``version`` so a PathCache drops its answers;
+        # incremental solvers follow barriers only, so costs are set before
+        # searching, not edited between searches.
+        costs = bytes(costs)
+        if len(costs) != self.size:
+            raise ValueError(f"cost layer has {len(costs)} cells, grid has {self.size}")
+        if b"\x00" in costs:
+            raise ValueError("terrain costs must be 1-255")
+        self.cost[:] = costs
+        self.min_cost = min(costs)
+        self.max_cost = max(costs)
+        self.version += 1
+
+    @property
+    def weighted(self):
+        return self.max_cost > 1
+
+    def is_barrier(self, index): return self.barrier[index] == 1
+    def is_start(self, index): return self.state[index] == CellState.START
+    def is_end(self, index): return self.state[index] == CellState.END
+
+    def reset(self, index): self.set_state(index, CellState.EMPTY)
+    def make_barrier(self, index): self.set_state(index, CellState.BARRIER)
+    def make_start(self, index): self.set_state(index, CellState.START)
+    def make_end(self, index): self.set_state(index, CellState.END)
+
+    def mark(self, index, state):
+        # Search overlays (open/closed/path) never paint over start, end or trees.
+        if _PAINTABLE[self.state[index]]:
+            self.state[index] = state
+            if self.changed is not None:
+                self.changed.add(index)
+                self.painted.add(index)
+
+    def neighbors(self, index):
+        return [index + offset for offset in self._offsets[self.adjacency[index]]]
+
+    def reset_search(self):
+        self.g[:] = array("i", [INF]) * self.size
+        self.parent[:] = array("i", [-1]) * self.size
+
+    def clear_search(self):
+        if self.changed is not None:
+            self.changed |= self.painted
+        self.painted.clear()
+        self.state[:] = self.state.translate(_CLEAR_SEARCH)
+        self.reset_search()
+
+
+def random_corridor(grid, start, end, rng=random):
+    # A random monotone staircase of cells from start to end.
+    row, col = grid.pos(start)
+    end_row, end_col = grid.pos(end)
+    dr = (end_row > row) - (end_row < row)
+    dc = (end_col > col) - (end_col < col)
+    cells = [start]
+    while (row, col) != (end_row, end_col):
+        rows_left = abs(end_row - row)
+        cols_left = abs(end_col - col)
+        if rng.random() * (rows_left + cols_left) < rows_left:
+            row += dr
+        else:
+            col += dc
+        cells.append(grid.index(row, col))
+    return cells
+
+
+def random_terrain(grid, barrier, rng=random):
+    # A cost layer of grass crossed by roads, with mud and water patches
+    # covering about TERRAIN_SHARES of the map.
+    # Roads are corridors between opposite edges and clear the trees on them.
+    rows, cols = grid.rows, grid.cols
+    costs = bytearray([GRASS]) * grid.size
+    for cost, share in TERRAIN_SHARES:
+        left = int(share * grid.size)
+        while left > 0:
+            radius = rng.randint(1, max(min(rows, cols) // 16, 2))
+            row, col = rng.randrange(rows), rng.randrange(cols)
+            for r in range(max(row - radius, 0), min(row + radius + 1, rows)):
+                half = radius - abs(r - row)
+                c0, c1 = max(col - half, 0), min(col + half + 1, cols)
+                costs[r * cols + c0:r * cols + c1] = bytes([cost]) * (c1 - c0)
+                left -= c1 - c0
+    for _ in range(max(min(rows, cols) // 24, 1)):
+        if rng.random() < 0.5:
+            a, b = grid.index(0, rng.randrange(cols)), grid.index(rows - 1, rng.randrange(cols))
+        else:
+            a, b = grid.index(rng.randrange(rows), 0), grid.index(rng.randrange(rows), cols - 1)
+        for i in random_corridor(grid, a, b, rng=rng):
+            costs[i] = ROAD
+            barrier[i] = 0
+    return costs
+
+
+def make_grid(rows, cols=None, density=BARRIER_DENSITY, connect=None, seed=None, terrain=False):
+    # ``connect=(start, end)`` keeps a random corridor between the two cells
+    # free of barriers, so they always share a component. A ``seed`` makes
+    # the map reproducible without touching the global random state. With
+    # ``terrain`` the map also gets a random_terrain cost layer; its barriers
+    # match the plain map of the same seed except where roads run.
+    rng = random if seed is None else random.Random(seed)
+    grid = Grid(rows, cols)
+    keep = set(random_corridor(grid, *connect, rng=rng)) if connect else ()
+    draw = rng.random
+    barrier = bytearray(draw() < density for _ in range(grid.size))
+    for i in keep:
+        barrier[i] = 0
+    if terrain:
+        grid.load_costs(random_terrain(grid, barrier, rng))
+    grid.load_barriers(barrier)
+    return grid
@@ -0,0 +1,366 @@
+# Hierarchical A* (HPA*). The grid is cut into square clusters. Each open
+# stretch of a cluster border gets one or two transitions: a pair of cells
+# facing each other across the border. Those cells are the abstract nodes.
+# They are linked across the border with cost 1, and to the other nodes of
+# their own cluster by their shortest in-cluster distance. A query links start
+# and end into that small graph, searches it, and refines each abstract edge
+# back into cells.
+#
+# In-cluster searches work on big-integer bitsets: one bit per cell, with each
+# row padded by a zero bit so shifts never wrap. A whole breadth-first layer
+# is then a handful of shifts and masks.
+import weakref
+
+from .openset import OpenSet
+from .solver import Solver, register_solver
+
+CLUSTER_SIZE = 16
+ENTRANCE_SPLIT = 6  # open border runs at least this long get a transition at each end
+INF = float("inf")
+
+_PASSABLE_DIGITS = bytes(ord("0") if i else ord("1") for i in range(256))
+
+
+def _spread(frontier, width, mask):
+    return ((frontier << 1) | (frontier >> 1) | (frontier << width) | (frontier >> width)) & mask
+
+
+def _distances(mask, width, source, targets):
+    # BFS distance inside ``mask`` from bit ``source`` to each reachable bit of
+    # ``targets``; stops once every target is found.
+    seen = frontier = 1 << source
+    found = {source: 0} if targets & frontier else {}
+    remaining = targets & ~seen
+    distance = 0
+    while frontier and remaining:
+        distance += 1
+        frontier = ((frontier << 1) | (frontier >> 1) | (frontier << width) | (frontier >> width)) & mask & ~seen
+        seen |= frontier
+        hit = frontier & remaining
+        if hit:
+            remaining ^= hit
+            for bit in _bits(hit):
+                found[bit] = distance
+    return found
+
+
+def _bits(bitset):
+    while bitset:
+        low = bitset & -bitset
+        yield low.bit_length() - 1
+        bitset ^= low
+
+
+class ClusterGraph:
+    # The cached abstraction for one grid. It follows barrier edits through
+    # grid.listeners: a toggled cell marks its cluster dirty, and the next
+    # refresh() rebuilds only that cluster's borders and the in-cluster edges of
+    # it and its four neighbours.
+    _cache = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def for_grid(cls, grid, cluster_size=CLUSTER_SIZE):
+        # Shared per grid and cluster size, built on first use and dropped with
+        # the grid.
+        graphs = cls._cache.setdefault(grid, {})
+        if cluster_size not in graphs:
+            graphs[cluster_size] = cls(grid, cluster_size)
+        return graphs[cluster_size]
+
+    def __init__(self, grid, cluster_size=CLUSTER_SIZE):
+        # Only a weak reference back to the grid, so a cached graph never keeps
+        # its grid alive.
+        self._grid = weakref.ref(grid)
+        self.cluster_size = cluster_size
+        self.cluster_rows = -(-grid.rows // cluster_size)
+        self.cluster_cols = -(-grid.cols // cluster_size)
+        self.clusters = self.cluster_rows * self.cluster_cols
+        self.masks = [self._mask(cluster) for cluster in range(self.clusters)]
+        self.transitions = {}  # (cluster, down) -> [(cell in cluster, cell across)]
+        self.inter = {}  # node -> {node across a border: 1}
+        self.intra = [None] * self.clusters  # cluster -> {node: {node: distance}}
+        self.segments = [{} for _ in range(self.clusters)]  # cluster -> {(a, b): cells} between its nodes
+        self.dirty = set()
+        self.rebuilt = 0
+        for cluster in range(self.clusters):
+            self._build_border(cluster, False)
+            self._build_border(cluster, True)
+        for cluster in range(self.clusters):
+            self._build_intra(cluster)
+        grid.listeners.append(self.on_toggle)
+
+    @property
+    def grid(self):
+        return self._grid()
+
+    def detach(self):
+        grid = self.grid
+        if grid is not None and self.on_toggle in grid.listeners:
+            grid.listeners.remove(self.on_toggle)
+            self._cache.get(grid, {}).pop(self.cluster_size, None)
+
+    def __len__(self):
+        return sum(len(nodes) for nodes in self.intra)
+
+    def cluster_of(self, cell):
+        row, col = divmod(cell, self.grid.cols)
+        return row // self.cluster_size * self.cluster_cols + col // self.cluster_size
+
+    def bounds(self, cluster):
+        grid = self.grid
+        row, col = divmod(cluster, self.cluster_cols)
+        r0, c0 = row * self.cluster_size, col * self.cluster_size
+        return r0, c0, min(r0 + self.cluster_size, grid.rows), min(c0 + self.cluster_size, grid.cols)
+
+    def _mask(self, cluster):
+        grid = self.grid
+        r0, c0, r1, c1 = self.bounds(cluster)
+        width = c1 - c0 + 1
+        mask = 0
+        for row in range(r0, r1):
+            chunk = grid.barrier[row * grid.cols + c0:row * grid.cols + c1]
+            mask |= int(chunk.translate(_PASSABLE_DIGITS)[::-1], 2) << ((row - r0) * width)
+        return mask
+
+    def _bit(self, cluster, cell):
+        r0, c0, r1, c1 = self.bounds(cluster)
+        row, col = divmod(cell, self.grid.cols)
+        return (row - r0) * (c1 - c0 + 1) + col - c0
+
+    def _cell(self, cluster, bit):
+        r0, c0, r1, c1 = self.bounds(cluster)
+        row, col = divmod(bit, c1 - c0 + 1)
+        return (r0 + row) * self.grid.cols + c0 + col
+
+    def _build_border(self, cluster, down):
+        # Transitions across the bottom (down) or right edge of a cluster.
+        grid = self.grid
+        cols = grid.cols
+        barrier = grid.barrier
+        r0, c0, r1, c1 = self.bounds(cluster)
+        if down:
+            pairs = [((r1 - 1) * cols + c, r1 * cols + c) for c in range(c0, c1)] if r1 < grid.rows else []
+        else:
+            pairs = [(r * cols + c1 - 1, r * cols + c1) for r in range(r0, r1)] if c1 < cols else []
+        for a, b in self.transitions.pop((cluster, down), ()):
+            del self.inter[a][b]
+            del self.inter[b][a]
+            if not self.inter[a]:
+                del self.inter[a]
+            if not self.inter[b]:
+                del self.inter[b]
+        transitions = []
+        run = []
+        for a, b in pairs + [(None, None)]:
+            if a is not None and not barrier[a] and not barrier[b]:
+                run.append((a, b))
+                continue
+            if len(run) >= ENTRANCE_SPLIT:
+                transitions += [run[0], run[-1]]
+            elif run:
+                transitions.append(run[len(run) // 2])
+            run = []
+        for a, b in transitions:
+            self.inter.setdefault(a, {})[b] = 1
+            self.inter.setdefault(b, {})[a] = 1
+        self.transitions[(cluster, down)] = transitions
+
+    def _borders(self, cluster):
+        # (border key, side) for the four borders of a cluster; side 0 is the
+        # cell inside this cluster when the border belongs to it.
+        row, col = divmod(cluster, self.cluster_cols)
+        yield (cluster, False), 0
+        yield (cluster, True), 0
+        if col:
+            yield (cluster - 1, False), 1
+        if row:
+            yield (cluster - self.cluster_cols, True), 1
+
+    def nodes(self, cluster):
+        return sorted({pair[side] for key, side in self._borders(cluster)
+                       for pair in self.transitions.get(key, ())})
+
+    def _build_intra(self, cluster):
+        nodes = self.nodes(cluster)
+        r0, c0, r1, c1 = self.bounds(cluster)
+        width = c1 - c0 + 1
+        cols = self.grid.cols
+        bits = [(node // cols - r0) * width + node % cols - c0 for node in nodes]
+        node_at = dict(zip(bits, nodes))
+        mask = self.masks[cluster]
+        edges = {node: {} for node in nodes}
+        for i, node in enumerate(nodes):
+            targets = 0
+            for bit in bits[i + 1:]:
+                targets |= 1 << bit
+            for bit, distance in _distances(mask, width, bits[i], targets).items():
+                other = node_at[bit]
+                edges[node][other] = distance
+                edges[other][node] = distance
+        self.intra[cluster] = edges
+        self.segments[cluster].clear()
+
+    def on_toggle(self, cell):
+        self.dirty.add(self.cluster_of(cell))
+
+    def refresh(self):
+        # Rebuild what barrier edits since the last refresh invalidated.
+        if not self.dirty:
+            return
+        affected = set()
+        for cluster in self.dirty:
+            self.masks[cluster] = self._mask(cluster)
+            for (owner, down), side in self._borders(cluster):
+                self._build_border(owner, down)
+                affected.add(owner)
+            affected.add(cluster)
+            row, col = divmod(cluster, self.cluster_cols)
+            if row + 1 < self.cluster_rows:
+                affected.add(cluster + self.cluster_cols)
+            if col + 1 < self.cluster_cols:
+                affected.add(cluster + 1)
+        for cluster in affected:
+            self._build_intra(cluster)
+        self.rebuilt += len(affected)
+        self.dirty.clear()
+
+    def edges(self, node):
+        intra = self.intra[self.cluster_of(node)].get(node)
+        inter = self.inter.get(node)
+        if intra and inter:
+            return [*intra.items(), *inter.items()]
+        return list((intra or inter or {}).items())
+
+    def link(self, cell, other=None):
+        # {node: distance} from ``cell`` to the abstract nodes of its cluster,
+        # plus ``other`` when it shares the cluster and is reachable inside it.
+        cluster = self.cluster_of(cell)
+        targets = 0
+        for node in self.intra[cluster]:
+            targets |= 1 << self._bit(cluster, node)
+        if other is not None and self.cluster_of(other) == cluster:
+            targets |= 1 << self._bit(cluster, other)
+        source = self._bit(cluster, cell)
+        r0, c0, r1, c1 = self.bounds(cluster)
+        return {self._cell(cluster, bit): distance
+                for bit, distance in _distances(self.masks[cluster], c1 - c0 + 1, source, targets).items()
+                if bit != source}
+
+    def segment(self, a, b):
+        # Cells of a shortest in-cluster path from a to b, excluding a. Only
+        # segments between abstract nodes are cached: they are bounded by the
+        # cluster's transitions, while a query's start and end are not.
+        cluster = self.cluster_of(a)
+        if cluster != self.cluster_of(b):
+            return [b]
+        nodes = self.intra[cluster]
+        if a not in nodes or b not in nodes:
+            return self._local_path(cluster, a, b)
+        cache = self.segments[cluster]
+        cells = cache.get((a, b))
+        if cells is None:
+            cells = cache[(a, b)] = self._local_path(cluster, a, b)
+        return cells
+
+    def _local_path(self, cluster, a, b):
+        mask = self.masks[cluster]
+        r0, c0, r1, c1 = self.bounds(cluster)
+        width = c1 - c0 + 1
+        target = 1 << self._bit(cluster, b)
+        seen = frontier = 1 << self._bit(cluster, a)
+        layers = [frontier]
+        while not frontier & target:
+            frontier = _spread(frontier, width, mask) & ~seen
+            if not frontier:
+                return []
+            seen |= frontier
+            layers.append(frontier)
+        bits = []
+        current = target
+        for layer in reversed(layers[:-1]):
+            bits.append(current.bit_length() - 1)
+            back = _spread(current, width, layer)
+            current = back & -back
+        bits.reverse()
+        return [self._cell(cluster, bit) for bit in bits]
+
+
+@register_solver("hpa")
+class HPAStar(Solver):
+    # A* over the ClusterGraph; step() expands one abstract node. Paths are
+    # near-optimal rather than optimal: they can only cross cluster borders at
+    # transitions.
+    label = "HPA*"
+
+    def __init__(self, grid, start, end, visualizer=None, graph=None, cluster_size=CLUSTER_SIZE):
+        super().__init__(grid, start, end, visualizer)
+        self.graph = ClusterGraph.for_grid(grid, cluster_size) if graph is None else graph
+        self.graph.refresh()
+        self.start_links = self.graph.link(start, end)
+        self.end_links = self.graph.link(end)
+        self.g = {start: 0}
+        self.parent = {}
+        self.open_set = OpenSet()
+        self.open_set.push(start, self._h(start))
+
+    def _h(self, cell):
+        row, col = divmod(cell, self.grid.cols)
+        end_row, end_col = divmod(self.end, self.grid.cols)
+        return abs(row - end_row) + abs(col - end_col)
+
+    def _edges(self, node):
+        edges = self.graph.edges(node)
+        if node == self.start:
+            edges += self.start_links.items()
+        if node in self.end_links:
+            edges.append((self.end, self.end_links[node]))
+        return edges
+
+    def step(self):
+        if self.done or self.open_set.empty():
+            self.done = True
+            return
+
+        current = self.open_set.pop()
+
+        if current == self.end:
+            self.finish(self.refine())
+            return
+
+        g = self.g
+        parent = self.parent
+        open_set = self.open_set
+        visualizer = self.visualizer
+        cols = self.grid.cols
+        end_row, end_col = divmod(self.end, cols)
+        base = g[current]
+        for neighbor, cost in self._edges(current):
+            temp_g = base + cost
+            if temp_g < g.get(neighbor, INF):
+                was_open = neighbor in open_set
+                if not was_open and neighbor in g:
+                    self.reopened += 1
+                g[neighbor] = temp_g
+                parent[neighbor] = current
+                row, col = divmod(neighbor, cols)
+                open_set.push(neighbor, temp_g + abs(row - end_row) + abs(col - end_col))
+                if not was_open:
+                    visualizer.open(neighbor)
+
+        self.visualizer.close(current)
+        if current != self.start:
+            self.visited_count += 1
+
+    def abstract_path(self):
+        nodes = [self.end]
+        while nodes[-1] != self.start:
+            nodes.append(self.parent[nodes[-1]])
+        nodes.reverse()
+        return nodes
+
+    def refine(self):
+        nodes = self.abstract_path()
+        path = []
+        for a, b in zip(nodes, nodes[1:]):
+            path += self.graph.segment(a, b)
+        return path
@@ -0,0 +1,144 @@
+from .grid import INF
+from .heuristics import h
+from .openset import OpenSet
+from .solver import Solver, register_solver
+
+HORIZONTAL = ((0, 1), (0, -1))
+VERTICAL = ((1, 0), (-1, 0))
+
+
+@register_solver("jps")
+class JumpPointSearch(Solver):
+    # Jump Point Search for the 4-connected, unit-cost grid. Canonical paths
+    # move horizontally before vertically, so a vertical run only turns where
+    # a wall beside it ends (a forced neighbour), and a horizontal run stops
+    # wherever a vertical probe from it finds a jump point. Same interface and
+    # visualizer hooks as AStar; only jump points enter the open set.
+    label = "JPS"
+
+    def __init__(self, grid, start, end, visualizer=None):
+        super().__init__(grid, start, end, visualizer)
+        self.open_set = OpenSet()
+        grid.reset_search()
+        grid.g[start] = 0
+        self.end_pos = grid.pos(end)
+        self.open_set.push(start, h(grid.pos(start), self.end_pos))
+        self.scanned_count = 0
+
+    def _blocked(self, row, col):
+        grid = self.grid
+        return not (0 <= row < grid.rows and 0 <= col < grid.cols) or grid.barrier[row * grid.cols + col]
+
+    def _jump_vertical(self, row, col, dr):
+        grid = self.grid
+        barrier = grid.barrier
+        rows, cols = grid.rows, grid.cols
+        step = dr * cols
+        index = row * cols + col
+        end = self.end
+        has_left = col > 0
+        has_right = col < cols - 1
+        scanned = 0
+        while True:
+            row += dr
+            index += step
+            scanned += 1
+            if not 0 <= row < rows or barrier[index]:
+                self.scanned_count += scanned
+                return None
+            previous = index - step
+            if (index == end
+                    or has_left and barrier[previous - 1] and not barrier[index - 1]
+                    or has_right and barrier[previous + 1] and not barrier[index + 1]):
+                self.scanned_count += scanned
+                return row, col
+
+    def _jump_horizontal(self, row, col, dc):
+        grid = self.grid
+        barrier = grid.barrier
+        cols = grid.cols
+        index = row * cols + col
+        end = self.end
+        jump_vertical = self._jump_vertical
+        while True:
+            col += dc
+            index += dc
+            self.scanned_count += 1
+            if not 0 <= col < cols or barrier[index]:
+                return None
+            if index == end or jump_vertical(row, col, 1) is not None or jump_vertical(row, col, -1) is not None:
+                return row, col
+
+    def _directions(self, current):
+        if current == self.start:
+            return HORIZONTAL + VERTICAL
+        grid = self.grid
+        row, col = grid.pos(current)
+        prow, pcol = grid.pos(grid.parent[current])
+        if prow == row:
+            dc = 1 if col > pcol else -1
+            return ((0, dc),) + VERTICAL
+        dr = 1 if row > prow else -1
+        directions = [(dr, 0)]
+        for side in (1, -1):
+            if self._blocked(row - dr, col + side) and not self._blocked(row, col + side):
+                directions.append((0, side))
+        return directions
+
+    def step(self):
+        if self.done or self.open_set.empty():
+            self.done = True
+            return
+
+        current = self.open_set.pop()
+
+        if current == self.end:
+            self.finish(self.reconstruct_path())
+            return
+
+        grid = self.grid
+        g = grid.g
+        row, col = grid.pos(current)
+        end_row, end_col = self.end_pos
+        for dr, dc in self._directions(current):
+            if dr:
+                point = self._jump_vertical(row, col, dr)
+            else:
+                point = self._jump_horizontal(row, col, dc)
+            if point is None:
+                continue
+            jump_row, jump_col = point
+            jump = grid.index(jump_row, jump_col)
+            temp_g = g[current] + abs(jump_row - row) + abs(jump_col - col)
+            if temp_g < g[jump]:
+                was_open = jump in self.open_set
+                if not was_open and g[jump] != INF:
+                    self.reopened += 1
+                grid.parent[jump] = current
+                g[jump] = temp_g
+                self.open_set.push(jump, temp_g + abs(jump_row - end_row) + abs(jump_col - end_col))
+                if not was_open:
+                    self.visualizer.open(jump)
+
+        self.visualizer.close(current)
+        if current != self.start:
+            self.visited_count += 1
+
+    def reconstruct_path(self):
+        # Jump points are joined by straight runs; expand them cell by cell.
+        grid = self.grid
+        path = []
+        current = self.end
+        while current != self.start:
+            previous = grid.parent[current]
+            row, col = grid.pos(current)
+            prow, pcol = grid.pos(previous)
+            dr = (prow > row) - (prow < row)
+            dc = (pcol > col) - (pcol < col)
+            while (row, col) != (prow, pcol):
+                path.append(grid.index(row, col))
+                row += dr
+                col += dc
+            current = previous
+        path.reverse()
+        return path
@@ -0,0 +1,118 @@
+from array import array
+
+from .grid import INF
+from .openset import OpenSet
+from .solver import Solver, register_solver
+
+
+@register_solver("lpastar")
+class LPAStar(Solver):
+    # Lifelong Planning A* (Koenig & Likhachev). The first solve() is an
+    # ordinary A*; after that the planner listens to the grid and, when cells
+    # turn into or stop being barriers, only re-expands the part of its search
+    # tree whose costs changed. Keeps its own g/rhs arrays so other solvers
+    # using grid.g in between do not disturb it; call detach() when done.
+    label = "LPA*"
+    incremental = True
+
+    def __init__(self, grid, start, end, visualizer=None):
+        super().__init__(grid, start, end, visualizer)
+        self.g = array("i", [INF]) * grid.size
+        self.rhs = array("i", [INF]) * grid.size
+        self.open_set = OpenSet()
+        self.end_row, self.end_col = grid.pos(end)
+        self.pending = set()
+        self.replans = 0
+        self.rhs[start] = 0
+        self.open_set.push(start, self.key(start))
+        grid.listeners.append(self.pending.add)
+
+    def detach(self):
+        if self.pending.add in self.grid.listeners:
+            self.grid.listeners.remove(self.pending.add)
+
+    def key(self, cell):
+        best = min(self.g[cell], self.rhs[cell])
+        row, col = divmod(cell, self.grid.cols)
+        return (best + abs(row - self.end_row) + abs(col - self.end_col), best)
+
+    def update_vertex(self, cell):
+        grid = self.grid
+        if cell != self.start:
+            if grid.barrier[cell]:
+                self.rhs[cell] = INF
+            else:
+                g = self.g
+                best = min((g[n] for n in grid.neighbors(cell)), default=INF)
+                self.rhs[cell] = INF if best == INF else best + 1
+        if self.g[cell] != self.rhs[cell]:
+            was_open = cell in self.open_set
+            self.open_set.update(cell, self.key(cell))
+            if not was_open:
+                self.visualizer.open(cell)
+        else:
+            self.open_set.discard(cell)
+
+    def apply_changes(self):
+        # Each toggled cell changes the edge costs around it; re-derive rhs for
+        # it and its four neighbours and let step() repair from there.
+        cells = set()
+        for cell in self.pending:
+            cells.add(cell)
+            row, col = divmod(cell, self.grid.cols)
+            for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                if self.grid.in_bounds(row + dr, col + dc):
+                    cells.add(cell + dr * self.grid.cols + dc)
+        self.pending.clear()
+        for cell in cells:
+            self.update_vertex(cell)
+        self.done = False
+        self.path = []
+        self.path_length = 0
+        self.path_cost = 0
+        self.replans += 1
+
+    def step(self):
+        if self.pending:
+            self.apply_changes()
+        if self.done:
+            return
+        end = self.end
+        open_set = self.open_set
+        if open_set.empty() or (open_set.min_priority() >= self.key(end) and self.rhs[end] == self.g[end]):
+            self.done = True
+            if self.g[end] != INF:
+                self.finish(self.reconstruct_path())
+            return
+
+        current = open_set.pop()
+        g, rhs = self.g, self.rhs
+        if g[current] > rhs[current]:
+            g[current] = rhs[current]
+            for neighbor in self.grid.neighbors(current):
+                self.update_vertex(neighbor)
+        else:
+            g[current] = INF
+            for neighbor in self.grid.neighbors(current):
+                self.update_vertex(neighbor)
+            self.update_vertex(current)
+
+        self.visualizer.close(current)
+        if current != self.start:
+            self.visited_count += 1
+
+    def prepare(self):
+        if self.pending:
+            self.apply_changes()
+
+    def reconstruct_path(self):
+        # Walk back from the goal along the cheapest predecessor.
+        path = []
+        g = self.g
+        neighbors = self.grid.neighbors
+        current = self.end
+        while current != self.start:
+            path.append(current)
+            current = min(neighbors(current), key=g.__getitem__)
+        path.reverse()
+        return path
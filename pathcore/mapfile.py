@@ -0,0 +1,168 @@
+# Compact on-disk maps. A file is a fixed header, the barrier layer packed
+# one bit per cell (each row padded to whole bytes, least significant bit
+# first) and an optional one-byte-per-cell terrain cost layer. MapFile reads
+# through mmap, so opening a map costs nothing and a tile read only touches
+# the pages under that tile.
+import mmap
+import struct
+
+from .grid import CellState, Grid
+
+MAGIC = b"PHMP"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHIIqqq")
+DATA_OFFSET = 64  # the header is padded so the layers start page-friendly
+HAS_COSTS = 1
+HAS_SEED = 2
+NONE = -1
+
+_UNPACK = [bytes((byte >> bit) & 1 for bit in range(8)) for byte in range(256)]
+_PACK = {bits: byte for byte, bits in enumerate(_UNPACK)}
+
+
+def pack_row(cells):
+    # 0/1 bytes -> bits; a short last group is padded with zeros.
+    cells = bytes(cells)
+    if len(cells) % 8:
+        cells += bytes(8 - len(cells) % 8)
+    return bytes(_PACK[cells[i:i + 8]] for i in range(0, len(cells), 8))
+
+
+def unpack_bits(packed, start, count):
+    # ``count`` 0/1 bytes for the cells from bit ``start`` of ``packed``.
+    first = start // 8
+    chunk = packed[first:(start + count + 7) // 8]
+    cells = b"".join(map(_UNPACK.__getitem__, chunk))
+    offset = start - first * 8
+    return cells[offset:offset + count]
+
+
+def save_grid(path, grid, start=None, end=None, seed=None, costs=None):
+    # ``costs`` is an optional bytes-like of one terrain cost per cell; by
+    # default a grid with terrain saves its own cost layer.
+    if costs is None and grid.weighted:
+        costs = grid.cost
+    if costs is not None and len(costs) != grid.size:
+        raise ValueError(f"cost layer has {len(costs)} cells, grid has {grid.size}")
+    flags = (HAS_COSTS if costs is not None else 0) | (HAS_SEED if seed is not None else 0)
+    header = HEADER.pack(MAGIC, VERSION, flags, 0, grid.rows, grid.cols,
+                         NONE if start is None else start, NONE if end is None else end,
+                         0 if seed is None else seed)
+    cols = grid.cols
+    barrier = memoryview(grid.barrier)
+    with open(path, "wb") as f:
+        f.write(header.ljust(DATA_OFFSET, b"\0"))
+        for row in range(grid.rows):
+            f.write(pack_row(barrier[row * cols:(row + 1) * cols]))
+        if costs is not None:
+            f.write(bytes(costs))
+
+
+class MapFile:
+    # Read-only, memory-mapped view of a saved map. read_barrier/read_costs
+    # and tiles() return only the requested window; to_grid() and read_grid()
+    # build an in-memory Grid of the whole map or of one window.
+    def __init__(self, path):
+        self.path = path
+        self._map = None
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path}: empty map file") from None
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path}: truncated map header")
+        magic, version, flags, _, rows, cols, start, end, seed = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path}: not a version {VERSION} map file")
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        self.start = None if start == NONE else start
+        self.end = None if end == NONE else end
+        self.seed = seed if flags & HAS_SEED else None
+        self.has_costs = bool(flags & HAS_COSTS)
+        self.row_bytes = (cols + 7) // 8
+        self.costs_offset = DATA_OFFSET + rows * self.row_bytes
+        expected = self.costs_offset + (self.size if self.has_costs else 0)
+        if len(self._map) < expected:
+            self.close()
+            raise ValueError(f"{path}: truncated map data")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def _window(self, row, col, height, width):
+        height = self.rows - row if height is None else height
+        width = self.cols - col if width is None else width
+        if row < 0 or col < 0 or row + height > self.rows or col + width > self.cols:
+            raise IndexError(f"window ({row}, {col}, {height}, {width}) is outside the {self.rows}x{self.cols} map")
+        return height, width
+
+    def is_barrier(self, row, col):
+        byte = self._map[DATA_OFFSET + row * self.row_bytes + col // 8]
+        return bool(byte >> (col % 8) & 1)
+
+    def read_barrier(self, row=0, col=0, height=None, width=None):
+        # Row-major 0/1 bytes for a window, unpacked row by row.
+        height, width = self._window(row, col, height, width)
+        data = self._map
+        row_bytes = self.row_bytes
+        rows = []
+        for r in range(row, row + height):
+            offset = DATA_OFFSET + r * row_bytes
+            rows.append(unpack_bits(data[offset:offset + row_bytes], col, width))
+        return bytearray(b"".join(rows))
+
+    def read_costs(self, row=0, col=0, height=None, width=None):
+        # Row-major cost bytes for a window, or None when the map has no costs.
+        if not self.has_costs:
+            return None
+        height, width = self._window(row, col, height, width)
+        data = self._map
+        base = self.costs_offset + col
+        return bytearray(b"".join(data[base + r * self.cols:base + r * self.cols + width]
+                                  for r in range(row, row + height)))
+
+    def tiles(self, size):
+        # (row, col, height, width, barrier) for each size x size tile, in
+        # row-major tile order; edge tiles are smaller.
+        for row in range(0, self.rows, size):
+            height = min(size, self.rows - row)
+            for col in range(0, self.cols, size):
+                width = min(size, self.cols - col)
+                yield row, col, height, width, self.read_barrier(row, col, height, width)
+
+    def read_grid(self, row=0, col=0, height=None, width=None):
+        # A Grid of one window, with start/end marked if they fall inside it.
+        height, width = self._window(row, col, height, width)
+        grid = Grid(height, width)
+        grid.load_barriers(self.read_barrier(row, col, height, width))
+        if self.has_costs:
+            grid.load_costs(self.read_costs(row, col, height, width))
+        for cell, state in ((self.start, CellState.START), (self.end, CellState.END)):
+            if cell is not None:
+                r, c = divmod(cell, self.cols)
+                if row <= r < row + height and col <= c < col + width:
+                    grid.set_state(grid.index(r - row, c - col), state)
+        return grid
+
+    def to_grid(self):
+        return self.read_grid()
+
+
+def load_grid(path):
+    # Whole map as (grid, start, end); start/end are None if none were saved.
+    with MapFile(path) as map_file:
+        return map_file.to_grid(), map_file.start, map_file.end
@@ -0,0 +1,146 @@
+# Vectorised map generation for large boards. Barrier masks are NumPy boolean
+# arrays (True = tree); grid_from_mask turns one into a Grid, deriving the
+# passability and adjacency layers with whole-array shifts instead of a
+# per-cell Python loop. Every generator takes a seed and is reproducible.
+from .grid import BARRIER_DENSITY, DOWN, LEFT, RIGHT, UP, CellState, Grid
+
+CAVE_DENSITY = 0.45
+CAVE_ITERATIONS = 4
+GENERATORS = ("random", "cave", "maze")
+
+_numpy = None  # imported on first use: NumPy is optional and slow to import
+
+
+def _require_numpy():
+    # The numpy module, for the NumPy code here and in pathcore.batch.
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("pathcore.mapgen and pathcore.batch need NumPy: pip install numpy") from None
+        _numpy = numpy
+    return _numpy
+
+
+def random_mask(rows, cols=None, density=BARRIER_DENSITY, seed=None):
+    np = _require_numpy()
+    cols = rows if cols is None else cols
+    return np.random.default_rng(seed).random((rows, cols)) < density
+
+
+def cave_mask(rows, cols=None, density=CAVE_DENSITY, iterations=CAVE_ITERATIONS, seed=None):
+    # Cellular-automata caves: start from noise, then a cell becomes a tree
+    # when 5+ of its 8 neighbours are trees (4+ if it already is one). The
+    # board edge counts as trees.
+    np = _require_numpy()
+    mask = random_mask(rows, cols, density, seed)
+    height, width = mask.shape
+    for _ in range(iterations):
+        padded = np.pad(mask, 1, constant_values=True).astype(np.uint8)
+        count = sum(padded[1 + dr:1 + dr + height, 1 + dc:1 + dc + width]
+                    for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc)
+        mask = (count >= 5) | (mask & (count >= 4))
+    return mask
+
+
+def _runs(starts, lengths):
+    # Concatenated ranges [start, start + length) for each pair.
+    np = _require_numpy()
+    offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return np.repeat(starts, lengths) + offsets
+
+
+def maze_mask(rows, cols=None, seed=None):
+    # Recursive division, run breadth-first so every chamber at one depth is
+    # split by the same handful of array operations. Walls sit on odd offsets
+    # and gaps on even offsets within each chamber, so a later wall never
+    # blocks an earlier gap and every open cell stays connected.
+    np = _require_numpy()
+    cols = rows if cols is None else cols
+    rng = np.random.default_rng(seed)
+    mask = np.zeros((rows, cols), dtype=bool)
+    chambers = np.array([[0, 0, rows, cols]], dtype=np.int64)
+    while len(chambers):
+        r0, c0, r1, c1 = chambers.T
+        height, width = r1 - r0, c1 - c0
+        splittable = (height >= 3) & (width >= 3)
+        r0, c0, r1, c1 = r0[splittable], c0[splittable], r1[splittable], c1[splittable]
+        height, width = height[splittable], width[splittable]
+        if not len(r0):
+            break
+        across = (height > width) | ((height == width) & (rng.random(len(r0)) < 0.5))
+        down = ~across
+        wall_row = r0 + 1 + 2 * rng.integers((height - 1) // 2)
+        gap_col = c0 + 2 * rng.integers((width + 1) // 2)
+        wall_col = c0 + 1 + 2 * rng.integers((width - 1) // 2)
+        gap_row = r0 + 2 * rng.integers((height + 1) // 2)
+        mask[np.repeat(wall_row[across], width[across]), _runs(c0[across], width[across])] = True
+        mask[_runs(r0[down], height[down]), np.repeat(wall_col[down], height[down])] = True
+        mask[wall_row[across], gap_col[across]] = False
+        mask[gap_row[down], wall_col[down]] = False
+        chambers = np.concatenate([
+            np.stack([r0, c0, wall_row, c1], axis=1)[across],
+            np.stack([wall_row + 1, c0, r1, c1], axis=1)[across],
+            np.stack([r0, c0, r1, wall_col], axis=1)[down],
+            np.stack([r0, wall_col + 1, r1, c1], axis=1)[down],
+        ])
+    return mask
+
+
+def corridor_cells(shape, start, end, seed=None):
+    # Row/col arrays of a random monotone staircase from start to end, drawn
+    # as one shuffled sequence of vertical and horizontal moves.
+    np = _require_numpy()
+    cols = shape[1]
+    (r0, c0), (r1, c1) = divmod(start, cols), divmod(end, cols)
+    moves = np.random.default_rng(seed).permutation(
+        np.r_[np.ones(abs(r1 - r0), dtype=bool), np.zeros(abs(c1 - c0), dtype=bool)])
+    rows = r0 + np.r_[0, np.cumsum(moves * np.sign(r1 - r0))]
+    cols = c0 + np.r_[0, np.cumsum(~moves * np.sign(c1 - c0))]
+    return rows, cols
+
+
+def adjacency_from_mask(mask):
+    np = _require_numpy()
+    passable = ~mask
+    adjacency = np.zeros(mask.shape, dtype=np.uint8)
+    adjacency[:-1, :] |= passable[1:, :] * np.uint8(DOWN)
+    adjacency[1:, :] |= passable[:-1, :] * np.uint8(UP)
+    adjacency[:, :-1] |= passable[:, 1:] * np.uint8(RIGHT)
+    adjacency[:, 1:] |= passable[:, :-1] * np.uint8(LEFT)
+    return adjacency
+
+
+def grid_view(grid, layer):
+    # Writable (rows, cols) NumPy view over one of a Grid's byte layers.
+    np = _require_numpy()
+    return np.frombuffer(getattr(grid, layer), dtype=np.uint8).reshape(grid.rows, grid.cols)
+
+
+def grid_from_mask(mask):
+    np = _require_numpy()
+    mask = np.asarray(mask, dtype=bool)
+    grid = Grid(*mask.shape)
+    grid_view(grid, "barrier")[:] = mask
+    grid_view(grid, "state")[:] = mask * np.uint8(CellState.BARRIER)
+    grid_view(grid, "adjacency")[:] = adjacency_from_mask(mask)
+    grid.version += 1
+    return grid
+
+
+def generate_grid(rows, cols=None, kind="random", seed=None, connect=None, **params):
+    # ``kind`` is one of GENERATORS; ``params`` go to that mask function.
+    # ``connect=(start, end)`` clears a corridor so the two cells share a
+    # component, as in make_grid.
+    if kind == "random":
+        mask = random_mask(rows, cols, seed=seed, **params)
+    elif kind == "cave":
+        mask = cave_mask(rows, cols, seed=seed, **params)
+    elif kind == "maze":
+        mask = maze_mask(rows, cols, seed=seed, **params)
+    else:
+        raise ValueError(f"unknown map generator {kind!r}; expected one of {', '.join(GENERATORS)}")
+    if connect:
+        mask[corridor_cells(mask.shape, *connect, seed=seed)] = False
+    return grid_from_mask(mask)
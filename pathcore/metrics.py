@@ -0,0 +1,115 @@
+# Per-frame timings for interactive loops. Sections of a frame are timed with
+# lap() (time since the previous lap) or section() (a with-block, for nested
+# sub-timings); end_frame() closes the frame, keeps it in a rolling window for
+# a HUD and appends it to a JSON-lines log. While disabled, lap() returns at
+# once and section() hands back one shared no-op context.
+import json
+import time
+from collections import deque
+
+FRAME_WINDOW = 120  # frames averaged for summary()
+
+
+class _NullSection:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+class _Section:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, time.perf_counter() - self.t0)
+        return False
+
+
+class FrameProfiler:
+    def __init__(self, enabled=False, log_path=None, window=FRAME_WINDOW):
+        self.enabled = enabled
+        self.log_path = log_path
+        self.log = None
+        self.frames = deque(maxlen=window)
+        self.count = 0
+        self.times = {}
+        self.frame_start = self.last_lap = time.perf_counter()
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.frames.clear()
+        self.begin_frame()
+        if not self.enabled:
+            self.close()
+        return self.enabled
+
+    def begin_frame(self):
+        self.times = {}
+        self.frame_start = self.last_lap = time.perf_counter()
+
+    def add(self, name, seconds):
+        self.times[name] = self.times.get(name, 0.0) + seconds
+
+    def lap(self, name):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.add(name, now - self.last_lap)
+        self.last_lap = now
+
+    def section(self, name):
+        return _Section(self, name) if self.enabled else _NULL_SECTION
+
+    def end_frame(self, **counters):
+        # Close the frame; ``counters`` (e.g. solver stats) go into its record.
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.count += 1
+        record = {
+            "frame": self.count,
+            "time": time.time(),
+            "frame_ms": (now - self.frame_start) * 1000,
+            "ms": {name: seconds * 1000 for name, seconds in self.times.items()},
+        }
+        record.update(counters)
+        self.frames.append(record)
+        if self.log_path:
+            if self.log is None:
+                self.log = open(self.log_path, "a")
+            self.log.write(json.dumps(record) + "\n")
+        self.begin_frame()
+
+    def summary(self):
+        # Mean and worst frame time, mean time per section over the window,
+        # and the counters of the latest frame.
+        if not self.frames:
+            return None
+        frames = self.frames
+        sections = {}
+        for record in frames:
+            for name, ms in record["ms"].items():
+                sections[name] = sections.get(name, 0.0) + ms
+        latest = {key: value for key, value in frames[-1].items() if key not in ("frame", "time", "frame_ms", "ms")}
+        return {
+            "frames": len(frames),
+            "frame_ms": sum(record["frame_ms"] for record in frames) / len(frames),
+            "max_frame_ms": max(record["frame_ms"] for record in frames),
+            "ms": {name: total / len(frames) for name, total in sections.items()},
+            **latest,
+        }
+
+    def close(self):
+        if self.log is not None:
+            self.log.close()
+            self.log = None
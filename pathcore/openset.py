@@ -0,0 +1,178 @@
+import heapq
+
+
+class OpenSet:
+    # Binary heap with lazy deletion: decrease_key pushes a fresh entry and
+    # the superseded one is skipped when it surfaces. Ties pop in FIFO order.
+    def __init__(self):
+        self._heap = []
+        self._entries = {}
+        self._count = 0
+        self.pushes = 0
+        self.pops = 0
+        self.stale_pops = 0
+        self.peak_size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __bool__(self):
+        return bool(self._entries)
+
+    def __contains__(self, item):
+        return item in self._entries
+
+    def empty(self):
+        return not self._entries
+
+    def priority(self, item):
+        return self._entries[item][0]
+
+    def push(self, item, priority):
+        entry = self._entries.get(item)
+        if entry is not None and entry[0] <= priority:
+            return False
+        self._count += 1
+        self._entries[item] = (priority, self._count)
+        heapq.heappush(self._heap, (priority, self._count, item))
+        self.pushes += 1
+        if len(self._entries) > self.peak_size:
+            self.peak_size = len(self._entries)
+        return True
+
+    decrease_key = push
+
+    def update(self, item, priority):
+        # Re-key in either direction (push only ever lowers a priority).
+        self._entries.pop(item, None)
+        self.push(item, priority)
+
+    def min_priority(self):
+        heap = self._heap
+        entries = self._entries
+        while heap:
+            priority, count, item = heap[0]
+            entry = entries.get(item)
+            if entry is not None and entry[1] == count:
+                return priority
+            heapq.heappop(heap)
+            self.stale_pops += 1
+        raise KeyError("min_priority of an empty open set")
+
+    def pop(self):
+        heap = self._heap
+        entries = self._entries
+        while heap:
+            priority, count, item = heapq.heappop(heap)
+            entry = entries.get(item)
+            if entry is not None and entry[1] == count:
+                del entries[item]
+                self.pops += 1
+                return item
+            self.stale_pops += 1
+        raise KeyError("pop from an empty open set")
+
+    def discard(self, item):
+        self._entries.pop(item, None)
+
+    def clear(self):
+        self._heap.clear()
+        self._entries.clear()
+
+
+class BucketQueue:
+    # Dial's bucket queue for integer priorities that never drop below the
+    # last one popped, as in A* with a consistent heuristic on integer costs.
+    # Live priorities fit in a ring of ``span`` buckets starting at the
+    # current minimum, so push and pop are list appends and pops plus a walk
+    # over empty buckets, however large the open set grows. Same interface and
+    # lazy deletion as OpenSet; ties pop newest first.
+    def __init__(self, span):
+        self._buckets = [[] for _ in range(span)]
+        self._span = span
+        self._cursor = 0
+        self._entries = {}
+        self.pushes = 0
+        self.pops = 0
+        self.stale_pops = 0
+        self.peak_size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __bool__(self):
+        return bool(self._entries)
+
+    def __contains__(self, item):
+        return item in self._entries
+
+    def empty(self):
+        return not self._entries
+
+    def priority(self, item):
+        return self._entries[item]
+
+    def push(self, item, priority):
+        entries = self._entries
+        entry = entries.get(item)
+        if entry is not None and entry <= priority:
+            return False
+        if not self._cursor <= priority < self._cursor + self._span:
+            if entries:
+                raise ValueError(f"priority {priority} outside the bucket window "
+                                 f"[{self._cursor}, {self._cursor + self._span})")
+            # Empty: start a new window at this priority.
+            for bucket in self._buckets:
+                bucket.clear()
+            self._cursor = priority
+        entries[item] = priority
+        self._buckets[priority % self._span].append(item)
+        self.pushes += 1
+        if len(entries) > self.peak_size:
+            self.peak_size = len(entries)
+        return True
+
+    decrease_key = push
+
+    def update(self, item, priority):
+        self._entries.pop(item, None)
+        self.push(item, priority)
+
+    def _advance(self):
+        # Move the cursor to the lowest bucket with a live entry on top.
+        buckets = self._buckets
+        entries = self._entries
+        span = self._span
+        cursor = self._cursor
+        bucket = buckets[cursor % span]
+        while True:
+            while bucket:
+                if entries.get(bucket[-1]) == cursor:
+                    self._cursor = cursor
+                    return bucket
+                bucket.pop()
+                self.stale_pops += 1
+            cursor += 1
+            bucket = buckets[cursor % span]
+
+    def min_priority(self):
+        if not self._entries:
+            raise KeyError("min_priority of an empty open set")
+        self._advance()
+        return self._cursor
+
+    def pop(self):
+        if not self._entries:
+            raise KeyError("pop from an empty open set")
+        item = self._advance().pop()
+        del self._entries[item]
+        self.pops += 1
+        return item
+
+    def discard(self, item):
+        self._entries.pop(item, None)
+
+    def clear(self):
+        for bucket in self._buckets:
+            bucket.clear()
+        self._entries.clear()
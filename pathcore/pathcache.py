@@ -0,0 +1,150 @@
+from collections import OrderedDict
+
+from .solver import solve
+from .trace import NullVisualizer
+
+MAX_ENTRIES = 4096
+MAX_CELLS = 1_000_000  # total path cells kept across all entries
+
+
+class PathCache:
+    # LRU cache of solved queries for one grid, keyed by (start, end,
+    # algorithm). An empty path records "no path". Entries follow barrier
+    # edits through grid.listeners and are dropped only when an edit can
+    # change their answer:
+    #   - a new barrier invalidates the paths that start at or run through it;
+    #   - a removed barrier invalidates "no path" entries, and paths whose
+    #     cost exceeds the cheapest possible detour via the opened cell (its
+    #     Manhattan detour at grid.min_cost a step), since only those could
+    #     get cheaper. On grids without terrain costs, cost is length.
+    # ``version`` is the grid version the entries were last checked against;
+    # a grid changed without telling its listeners (load_barriers) no longer
+    # matches it, and the whole cache is dropped.
+    def __init__(self, grid, max_entries=MAX_ENTRIES, max_cells=MAX_CELLS):
+        self.grid = grid
+        self.max_entries = max_entries
+        self.max_cells = max_cells
+        self.entries = OrderedDict()
+        self.costs = {}
+        self.by_cell = {}
+        self.cells = 0
+        self.version = grid.version
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        grid.listeners.append(self.on_toggle)
+
+    def detach(self):
+        if self.on_toggle in self.grid.listeners:
+            self.grid.listeners.remove(self.on_toggle)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, start, end, algorithm="astar"):
+        # The cached path, or None on a miss. A cached end -> start answer
+        # is reused in reverse, since every move costs the same both ways.
+        self._check_version()
+        key = (start, end, algorithm)
+        path = self.entries.get(key)
+        if path is None:
+            reverse = self.entries.get((end, start, algorithm))
+            if reverse is not None:
+                self.entries.move_to_end((end, start, algorithm))
+                self.hits += 1
+                return [end, *reverse[:-1]][::-1] if reverse else []
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return list(path)
+
+    def put(self, start, end, path, algorithm="astar"):
+        self._check_version()
+        key = (start, end, algorithm)
+        self._remove(key)
+        if len(path) > self.max_cells:
+            return
+        path = tuple(path)
+        self.entries[key] = path
+        cost = self.grid.cost
+        self.costs[key] = sum(cost[cell] for cell in path)
+        for cell in (start, *path):
+            self.by_cell.setdefault(cell, set()).add(key)
+        self.cells += len(path)
+        while len(self.entries) > self.max_entries or self.cells > self.max_cells:
+            self._remove(next(iter(self.entries)))
+            self.evictions += 1
+
+    def solve(self, start, end, algorithm="astar", components=None, **options):
+        path = self.get(start, end, algorithm)
+        if path is None:
+            path = solve(self.grid, start, end, algorithm, NullVisualizer(), components, **options).path
+            self.put(start, end, path, algorithm)
+        return path
+
+    def _check_version(self):
+        if self.version != self.grid.version:
+            self.invalidations += len(self.entries)
+            self.clear()
+            self.version = self.grid.version
+
+    def _remove(self, key):
+        path = self.entries.pop(key, None)
+        if path is None:
+            return False
+        del self.costs[key]
+        for cell in (key[0], *path):
+            keys = self.by_cell[cell]
+            keys.discard(key)
+            if not keys:
+                del self.by_cell[cell]
+        self.cells -= len(path)
+        return True
+
+    def on_toggle(self, cell):
+        # The grid has bumped its version for this toggle; any other bump
+        # since the last check was an unannounced change.
+        if self.version != self.grid.version - 1:
+            self.invalidations += len(self.entries)
+            self.clear()
+        if self.grid.barrier[cell]:
+            stale = list(self.by_cell.get(cell, ()))
+        else:
+            cols = self.grid.cols
+            min_cost = self.grid.min_cost
+            row, col = divmod(cell, cols)
+            stale = []
+            for key, path in self.entries.items():
+                if not path:
+                    stale.append(key)
+                    continue
+                start_row, start_col = divmod(key[0], cols)
+                end_row, end_col = divmod(key[1], cols)
+                detour = abs(row - start_row) + abs(col - start_col) + abs(row - end_row) + abs(col - end_col)
+                if min_cost * detour < self.costs[key]:
+                    stale.append(key)
+        for key in stale:
+            self._remove(key)
+        self.invalidations += len(stale)
+        self.version = self.grid.version
+
+    def clear(self):
+        self.entries.clear()
+        self.costs.clear()
+        self.by_cell.clear()
+        self.cells = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "entries": len(self.entries),
+            "cells": self.cells,
+        }
@@ -0,0 +1,6 @@
+def calculate_score(player_moves, optimal_path_length, time_taken):
+    if optimal_path_length == 0 or player_moves == 0:
+        return 0
+    efficiency = min(optimal_path_length / player_moves, 1.0)
+    time_bonus = max(100 - time_taken, 10)
+    return int(100 * efficiency * (time_bonus / 100))
@@ -0,0 +1,205 @@
+# Headless games on a fixed-timestep logical clock. A Game ticks its clock
+# once per frame, the way the client does; the player moves a fixed distance
+# per tick and the score's time is ticks * dt, so a seeded game with the same
+# input plays out the same on any machine and as fast as the CPU allows.
+# Input comes from a bot: something with start(game) and move(game), asked
+# for the next cell whenever the player stands still. run_games() plays many
+# seeded games across processes.
+import math
+import os
+import random
+import time
+from functools import partial
+
+from .grid import BARRIER_DENSITY, make_grid
+from .scoring import calculate_score
+from .solver import solve
+from .trace import NullVisualizer
+
+FIXED_DT = 1 / 60  # logical seconds per tick; the client runs one tick per frame at 60 FPS
+PLAYER_SPEED = 0.35  # cells per tick
+MAX_TICKS = 60 * 60 * 10  # a game still running after ten logical minutes is abandoned
+
+
+class WallClock:
+    def time(self):
+        return time.time()
+
+
+class FixedClock:
+    # Time moves only when tick() is called, by ``dt`` per tick.
+    def __init__(self, dt=FIXED_DT):
+        self.dt = dt
+        self.ticks = 0
+
+    def time(self):
+        return self.ticks * self.dt
+
+    def tick(self):
+        self.ticks += 1
+
+
+def cell_center(grid, index):
+    # Board position of a cell's centre, in cells.
+    row, col = grid.pos(index)
+    return [col + 0.5, row + 0.5]
+
+
+class Player:
+    def __init__(self, grid, start, clock=None, speed=PLAYER_SPEED):
+        self.grid = grid
+        self.clock = clock or WallClock()
+        self.speed = speed
+        self.current_cell = start
+        self.path = [start]
+        self.score = 0
+        self.moves = 0
+        self.start_time = self.clock.time()
+        self.pos = cell_center(grid, start)
+        self.target_pos = self.pos.copy()
+        self.moving = False
+
+    def elapsed(self):
+        return self.clock.time() - self.start_time
+
+    def move_to(self, new_cell):
+        if new_cell in self.grid.neighbors(self.current_cell) and not self.moving:
+            self.current_cell = new_cell
+            self.path.append(new_cell)
+            self.moves += 1
+            self.target_pos = cell_center(self.grid, new_cell)
+            self.moving = True
+            return True
+        return False
+
+    def update(self):
+        if self.moving:
+            dx = self.target_pos[0] - self.pos[0]
+            dy = self.target_pos[1] - self.pos[1]
+            dist = math.sqrt(dx**2 + dy**2)
+            if dist > self.speed:
+                self.pos[0] += dx / dist * self.speed
+                self.pos[1] += dy / dist * self.speed
+            else:
+                self.pos = self.target_pos.copy()
+                self.moving = False
+
+
+class ScriptedBot:
+    # Replays a fixed list of cells, e.g. moves recorded from a real game.
+    def __init__(self, cells):
+        self.cells = list(cells)
+
+    def start(self, game):
+        self.next = iter(self.cells)
+
+    def move(self, game):
+        return next(self.next, None)
+
+
+class PathBot:
+    # Walks a shortest path. With ``mistake_rate`` it sometimes steps to a
+    # random open neighbour instead and replans from there; ``think_ticks``
+    # is how long it stands still before each move.
+    def __init__(self, mistake_rate=0.0, think_ticks=0, algorithm="astar"):
+        self.mistake_rate = mistake_rate
+        self.think_ticks = think_ticks
+        self.algorithm = algorithm
+
+    def start(self, game):
+        self.route = []
+        self.waited = 0
+
+    def move(self, game):
+        if self.waited < self.think_ticks:
+            self.waited += 1
+            return None
+        self.waited = 0
+        grid, cell = game.grid, game.player.current_cell
+        if self.mistake_rate and game.rng.random() < self.mistake_rate:
+            options = [n for n in grid.neighbors(cell) if not grid.barrier[n]]
+            self.route = []
+            return game.rng.choice(options) if options else None
+        if not self.route:
+            if cell == game.start and self.algorithm == game.algorithm:
+                path = game.optimal().path
+            else:
+                path = solve(grid, cell, game.end, self.algorithm, NullVisualizer()).path
+            self.route = list(reversed(path))
+        return self.route.pop() if self.route else None
+
+
+class Game:
+    # One round on a seeded map: the player walks from start to end, then the
+    # run is scored against ``algorithm``'s path, as in the client.
+    def __init__(self, seed, rows=50, density=BARRIER_DENSITY, algorithm="astar", dt=FIXED_DT):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.algorithm = algorithm
+        cells = rows * rows
+        self.start, self.end = self.rng.sample(range(cells), 2)
+        self.grid = make_grid(rows, density=density, connect=(self.start, self.end), seed=seed)
+        self.clock = FixedClock(dt)
+        self.player = Player(self.grid, self.start, self.clock)
+        self.play_time = None
+        self.optimal_path_length = 0
+        self.solver = None
+
+    @property
+    def finished(self):
+        return self.play_time is not None
+
+    def tick(self, bot):
+        self.clock.tick()
+        player = self.player
+        player.update()
+        if not player.moving:
+            cell = bot.move(self)
+            if cell is not None and player.move_to(cell) and cell == self.end:
+                self.finish()
+
+    def optimal(self):
+        # The scoring search, run once per game and shared with bots.
+        if self.solver is None:
+            self.solver = solve(self.grid, self.start, self.end, self.algorithm, NullVisualizer())
+        return self.solver
+
+    def finish(self):
+        self.play_time = self.player.elapsed()
+        self.optimal_path_length = self.optimal().path_length
+        self.player.score = calculate_score(self.player.moves, self.optimal_path_length, self.play_time)
+
+    def play(self, bot, max_ticks=MAX_TICKS):
+        bot.start(self)
+        while not self.finished and self.clock.ticks < max_ticks:
+            self.tick(bot)
+        return self.result()
+
+    def result(self):
+        return {
+            "seed": self.seed,
+            "finished": self.finished,
+            "ticks": self.clock.ticks,
+            "moves": self.player.moves,
+            "optimal": self.optimal_path_length,
+            "seconds": self.play_time,
+            "score": self.player.score,
+        }
+
+
+def play_game(seed, bot, max_ticks=MAX_TICKS, **options):
+    return Game(seed, **options).play(bot, max_ticks)
+
+
+def run_games(seeds, bot, jobs=None, max_ticks=MAX_TICKS, **options):
+    # Results of play_game for every seed, in order, spread over ``jobs``
+    # processes (one per CPU by default; 1 plays them in this process). Each
+    # process gets its own copy of ``bot``.
+    seeds = list(seeds)
+    play = partial(play_game, bot=bot, max_ticks=max_ticks, **options)
+    if jobs == 1:
+        return [play(seed) for seed in seeds]
+    from concurrent.futures import ProcessPoolExecutor  # deferred: slow to import, and only pools need it
+    workers = jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as pool:
+        return list(pool.map(play, seeds, chunksize=max(len(seeds) // (4 * workers), 1)))
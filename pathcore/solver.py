@@ -0,0 +1,128 @@
+import time
+
+from .trace import GridPainter
+
+SOLVERS = {}
+
+
+def register_solver(name):
+    def register(cls):
+        cls.name = name
+        SOLVERS[name] = cls
+        return cls
+    return register
+
+
+def solver_names():
+    return list(SOLVERS)
+
+
+def create_solver(name, grid, start, end, visualizer=None, **options):
+    try:
+        cls = SOLVERS[name]
+    except KeyError:
+        raise ValueError(f"unknown search algorithm {name!r}; expected one of {', '.join(SOLVERS)}") from None
+    return cls(grid, start, end, visualizer, **options)
+
+
+def solve(grid, start, end, algorithm="astar", visualizer=None, components=None, **options):
+    # With a ComponentIndex, queries whose ends lie in different components
+    # come back finished and pathless without expanding anything.
+    solver = create_solver(algorithm, grid, start, end, visualizer, **options)
+    if components is not None and not components.reachable(start, end):
+        solver.reject()
+    else:
+        solver.solve()
+    return solver
+
+
+class Solver:
+    # Common step/solve interface. Subclasses implement step(), expanding one
+    # node per call, set ``done`` when finished and report open/closed/path
+    # events to ``visualizer``.
+    name = None
+    label = None
+    incremental = False  # True when solve() can be called again after the grid changes
+
+    def __init__(self, grid, start, end, visualizer=None):
+        self.grid = grid
+        self.start = start
+        self.end = end
+        self.visualizer = GridPainter(grid) if visualizer is None else visualizer
+        self.visited_count = 0
+        self.reopened = 0  # closed nodes pushed again after a shorter path turned up
+        self.path_length = 0
+        self.path_cost = 0  # terrain cost of the path; equals path_length on grids without costs
+        self.elapsed = 0.0
+        self.done = False
+        self.path = []
+
+    @property
+    def peak_open_size(self):
+        return self.open_set.peak_size
+
+    @property
+    def open_sets(self):
+        open_set = getattr(self, "open_set", None)
+        return () if open_set is None else (open_set,)
+
+    def step(self):
+        raise NotImplementedError
+
+    def detach(self):
+        pass
+
+    def prepare(self):
+        # Called before stepping starts; incremental solvers fold in grid
+        # edits made since the last solve here.
+        pass
+
+    def solve(self):
+        self.prepare()
+        t0 = time.perf_counter()
+        while not self.done:
+            self.step()
+        self.elapsed += time.perf_counter() - t0
+        return self.path
+
+    def finish(self, path):
+        self.visualizer.path(path)
+        self.path = path
+        self.path_length = len(path)
+        cost = self.grid.cost
+        self.path_cost = sum(cost[cell] for cell in path)
+        self.done = True
+
+    def reconstruct_path(self):
+        # Follow grid.parent back from the end; solvers that record parents
+        # some other way override this.
+        path = []
+        parent = self.grid.parent
+        current = self.end
+        while current != self.start:
+            path.append(current)
+            current = parent[current]
+        path.reverse()
+        return path
+
+    def reject(self):
+        # Finish without searching, for queries already known to have no path.
+        self.path = []
+        self.path_length = 0
+        self.path_cost = 0
+        self.done = True
+
+    def stats(self):
+        open_sets = self.open_sets
+        return {
+            "algorithm": self.name,
+            "expansions": self.visited_count,
+            "expansions_per_sec": self.visited_count / self.elapsed if self.elapsed else 0.0,
+            "peak_open": self.peak_open_size,
+            "reopened": self.reopened,
+            "heap_pushes": sum(open_set.pushes for open_set in open_sets),
+            "heap_pops": sum(open_set.pops + open_set.stale_pops for open_set in open_sets),
+            "path_length": self.path_length,
+            "path_cost": self.path_cost,
+            "seconds": self.elapsed,
+        }
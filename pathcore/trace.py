@@ -0,0 +1,142 @@
+import time
+from array import array
+
+from .grid import CellState
+
+OPEN = int(CellState.OPEN)
+CLOSED = int(CellState.CLOSED)
+PATH = int(CellState.PATH)
+
+
+class GridPainter:
+    # Default search visualizer: paints open/closed/path straight onto the grid.
+    def __init__(self, grid):
+        self.grid = grid
+
+    def open(self, cell):
+        self.grid.mark(cell, OPEN)
+
+    def close(self, cell):
+        self.grid.mark(cell, CLOSED)
+
+    def path(self, cells):
+        for cell in cells:
+            self.grid.mark(cell, PATH)
+
+
+class NullVisualizer:
+    # Discards search events; for headless callers that only want the path.
+    def open(self, cell):
+        pass
+
+    def close(self, cell):
+        pass
+
+    def path(self, cells):
+        pass
+
+
+class SearchTrace:
+    # Compact record of a finished search. Event kinds are CellState values so
+    # replaying an event is a single Grid.mark call; ``expansions[k]`` is the
+    # event offset just after the k-th expanded node. A trace still streaming
+    # in from a running search has ``complete`` unset.
+    def __init__(self, complete=True):
+        self.kinds = bytearray()
+        self.cells = array("i")
+        self.expansions = array("i")
+        self.complete = complete
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def open(self, cell):
+        self.kinds.append(OPEN)
+        self.cells.append(cell)
+
+    def close(self, cell):
+        self.kinds.append(CLOSED)
+        self.cells.append(cell)
+        self.expansions.append(len(self.kinds))
+
+    def path(self, cells):
+        for cell in cells:
+            self.kinds.append(PATH)
+            self.cells.append(cell)
+
+    def extend(self, other):
+        offset = len(self.kinds)
+        self.kinds += other.kinds
+        self.cells.extend(other.cells)
+        self.expansions.extend(offset + end for end in other.expansions)
+
+    def replay(self, grid, start=0, stop=None):
+        kinds = self.kinds
+        cells = self.cells
+        for i in range(start, len(kinds) if stop is None else stop):
+            grid.mark(cells[i], kinds[i])
+
+
+class TracePlayer:
+    # Plays a SearchTrace back onto a grid a few expansions per frame, or for
+    # as long as a per-frame time budget allows, independently of the solver.
+    # An incomplete trace is played as far as it has arrived; the player is
+    # done once the trace is complete and fully replayed.
+    def __init__(self, trace, grid, expansions_per_frame=1, time_budget=None):
+        self.trace = trace
+        self.grid = grid
+        self.expansions_per_frame = expansions_per_frame
+        self.time_budget = time_budget
+        self.position = 0
+        self.expansion = 0
+        self.skipping = False
+        self.done = trace.complete and not len(trace)
+
+    @property
+    def visited_count(self):
+        return max(min(self.expansion, len(self.trace.expansions)) - 1, 0)
+
+    def _advance(self, expansion):
+        trace = self.trace
+        if expansion < len(trace.expansions):
+            stop = trace.expansions[expansion]
+        else:
+            stop = len(trace)
+        trace.replay(self.grid, self.position, stop)
+        self.position = stop
+        self.expansion = expansion + 1
+        self.done = trace.complete and stop == len(trace)
+
+    def _waiting(self):
+        # Caught up with a trace that is still arriving.
+        return not self.trace.complete and self.expansion >= len(self.trace.expansions)
+
+    def step(self):
+        if self.done:
+            return
+        if self.skipping:
+            self.skip_to_end()
+            return
+        if self.time_budget is None:
+            for _ in range(self.expansions_per_frame):
+                if self._waiting():
+                    return
+                self._advance(self.expansion)
+                if self.done:
+                    return
+            return
+        deadline = time.perf_counter() + self.time_budget
+        while not self.done and not self._waiting():
+            self._advance(self.expansion)
+            if time.perf_counter() >= deadline:
+                return
+
+    def skip_to_end(self):
+        # On an incomplete trace, later step() calls keep replaying whatever
+        # has arrived until it completes.
+        if not self.done:
+            self.trace.replay(self.grid, self.position)
+            self.position = len(self.trace)
+            self.expansion = len(self.trace.expansions) + 1
+            self.skipping = True
+            self.done = self.trace.complete
@@ -0,0 +1,145 @@
+# Searches on a background thread, so a UI loop keeps drawing while a long
+# search runs. Each submitted query becomes a SearchJob. The worker steps its
+# solver in slices, posts the events recorded in each slice to the job's
+# queue and checks for cancellation between slices. The submitting thread
+# drains the queue into ``job.trace`` with poll(), so display state on the
+# grid is only ever marked from that thread.
+#
+# A thread rather than a process: solvers share the grid and the structures
+# that follow it (ComponentIndex, ClusterGraph, an incremental solver's own
+# state), and solvers never read the grid's display state.
+import queue
+import threading
+import time
+
+from .trace import SearchTrace
+
+SLICE_EXPANSIONS = 256  # expansions between posts and cancellation checks
+
+_DONE = object()
+_CANCELLED = object()
+
+
+class SearchJob:
+    def __init__(self, create, path=None, reject=False, slice_expansions=SLICE_EXPANSIONS, solver=None):
+        self.create = create
+        self.known_path = path
+        self.reject = reject
+        self.slice_expansions = slice_expansions
+        self.solver = solver
+        self.trace = SearchTrace(complete=False)
+        self.results = queue.Queue()
+        self.cancelled = threading.Event()
+        self.done = False
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def _take(self, item):
+        if item is _DONE:
+            self.done = True
+            self.trace.complete = True
+        elif item is _CANCELLED:
+            self.done = True  # the trace stays incomplete
+        elif isinstance(item, BaseException):
+            self.done = True
+            raise item
+        else:
+            self.trace.extend(item)
+
+    def poll(self):
+        # Move everything posted so far into ``trace``. True once the search
+        # has finished or stopped after cancel(); a search that failed on the
+        # worker raises here.
+        while not self.done:
+            try:
+                item = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self._take(item)
+        return self.done
+
+    def wait(self, timeout=None):
+        # poll() until the search finishes; False on timeout.
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not self.done:
+            try:
+                item = self.results.get(timeout=None if deadline is None else max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                return False
+            self._take(item)
+        return True
+
+    def abandon(self):
+        # A cancelled solver is never handed back, so it lets go of the grid
+        # here rather than keep following edits.
+        if self.solver is not None:
+            self.solver.detach()
+        self.results.put(_CANCELLED)
+
+    def run(self):
+        if self.cancelled.is_set():
+            self.abandon()
+            return
+        batch = SearchTrace()
+        try:
+            solver = self.solver = self.create(batch)
+            solver.visualizer = batch
+            if self.known_path is not None:
+                solver.finish(self.known_path)
+            elif self.reject:
+                solver.reject()
+            else:
+                solver.prepare()
+            while not solver.done:
+                t0 = time.perf_counter()
+                for _ in range(self.slice_expansions):
+                    solver.step()
+                    if solver.done:
+                        break
+                solver.elapsed += time.perf_counter() - t0
+                if self.cancelled.is_set():
+                    self.abandon()
+                    return
+                if not solver.done:
+                    self.results.put(batch)
+                    batch = solver.visualizer = SearchTrace()
+                    # Hand the GIL over now rather than after the interpreter's
+                    # switch interval, so a waiting UI thread isn't held up.
+                    time.sleep(0)
+        except Exception as error:
+            self.results.put(error)
+            return
+        self.results.put(batch)
+        self.results.put(_DONE)
+
+
+class SearchWorker:
+    # One long-lived thread that runs submitted jobs in order.
+    def __init__(self):
+        self.jobs = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="search-worker", daemon=True)
+        self.thread.start()
+
+    def submit(self, create, path=None, reject=False, slice_expansions=SLICE_EXPANSIONS, solver=None):
+        # ``create(visualizer)`` returns the solver and runs on the worker, so
+        # building a solver's own index (HPA*'s cluster graph) doesn't stall
+        # the caller either. With ``path`` the solver is finished with that
+        # known answer, e.g. a cached one, and with ``reject`` it is finished
+        # pathless (Solver.reject) instead of searching. ``solver`` is the one
+        # create() will return when that is known up front, a reused
+        # incremental solver, so a job cancelled before it starts still
+        # detaches it.
+        job = SearchJob(create, path, reject, slice_expansions, solver)
+        self.jobs.put(job)
+        return job
+
+    def close(self):
+        self.jobs.put(None)
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            job.run()
@@ -1,8 +1,12 @@
 import pygame
 import math
-from queue import PriorityQueue
 import random
-import time
+import sys
+
+from pathcore import GRASS, MUD, ROAD, SOLVERS, CellState, ComponentIndex, FrameProfiler, PathCache, SearchWorker, TracePlayer, create_solver, make_grid, calculate_score, solver_names
+from pathcore import sim
+from pathcore.mapfile import MapFile, save_grid
+from pathcore.sim import FIXED_DT, FixedClock, cell_center
 
 pygame.init()
 
@@ -15,6 +19,8 @@ pygame.display.set_caption("Path Hunter - Race Against A*!")
 
 CLOCK = pygame.time.Clock()
 FPS = 60
+GAME_CLOCK = FixedClock(FIXED_DT)  # Logical time: one tick per elapsed FIXED_DT, read for move timers and the score
+MAX_CATCH_UP = 0.25  # seconds of game time run at most after one slow frame
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -29,12 +35,15 @@ ORANGE = (255, 165, 0)  # Player path
 LIGHT_BLUE = (135, 206, 235)  # Buttons
 BEIGE = (245, 245, 220)  # Parchment background
 GRASS_GREEN = (154, 205, 50)  # Ground
+ROAD_TAN = (210, 180, 140)  # Road terrain
+MUD_BROWN = (120, 90, 50)  # Mud terrain
+WATER_BLUE = (70, 130, 200)  # Water terrain
 TREE_GREEN = (34, 139, 34)  # Barriers (trees)
 BROWN = (139, 69, 19)  # Grid lines (paths)
 
-GAP = WIDTH // ROWS
 GRID_OFFSET_X = 0
 GRID_OFFSET_Y = 0
+BOARD_RECT = pygame.Rect(GRID_OFFSET_X, GRID_OFFSET_Y, WIDTH, WIDTH)  # Viewport the board is drawn into
 
 # UI Settings
 BUTTON_COLOR = LIGHT_BLUE
@@ -47,14 +56,37 @@ BUTTON_MARGIN = 10
 
 FONT = pygame.font.SysFont("arial", 20)
 TITLE_FONT = pygame.font.SysFont("arial", 36)
+HUD_FONT = pygame.font.SysFont("consolas", 14)
 
 try:
     CLICK_SOUND = pygame.mixer.Sound("click.wav")
 except:
     CLICK_SOUND = None
 
-PLAYER_SPEED = 5
-ASTAR_ANIMATION_SPEED = 0.05  # Seconds per A* step
+ZOOM_LEVELS = (0.125, 0.25, 0.5, 1, 2, 3, 4, 6, 8, 10, 14, 20, 28, 40)  # Pixels per cell; the fit-to-window size is added
+LOD_CELL_SIZE = 6  # Below this many pixels per cell the board is drawn as a scaled overview image
+FOLLOW_MARGIN = 0.25  # Share of the viewport kept between a followed player and its edge
+DEFAULT_ALGORITHM = 'astar'
+ASTAR_PLAYBACK_EXPANSIONS = 3  # Replayed A* expansions per frame
+ASTAR_PLAYBACK_BUDGET = None  # Seconds of replay per frame; overrides the expansion count when set
+INCREMENTAL_RENDER = True  # Redraw only changed cells; False repaints the whole board every frame
+FADE_SPEED = 20
+GROUND_VARIANTS = 8  # Pre-drawn tiles per ground type the board background is tiled from
+TERRAIN_MAPS = False  # Random maps get roads, mud and water; only the Dial A* solver counts terrain costs
+MAX_CACHED_SURFACES = 256  # Rendered text and overlay surfaces kept between frames
+MAP_PATH = None  # Saved map to play instead of random ones, from the command line
+SAVE_PATH = "map.phm"  # Written by the S key while playing
+PROFILE_LOG = "profile.jsonl"  # Frame metrics are appended here as JSON lines while the F3 HUD is on
+HUD_RECT = pygame.Rect(10, 10, 250, 280)
+STATE_COLORS = {CellState.OPEN: GREEN, CellState.CLOSED: RED, CellState.PATH: YELLOW}
+STATE_ALPHA = {CellState.OPEN: 128, CellState.CLOSED: 128, CellState.PATH: 255}
+SETTLED_ALPHA = bytes(STATE_ALPHA.get(state, 255) for state in range(256))  # state -> alpha at the end of its fade
+OVERVIEW_COLORS = [GRASS_GREEN, TREE_GREEN, BROWN, BLUE, GREEN, RED, YELLOW]  # Indexed by CellState
+GROUND_COLORS = {"road": ROAD_TAN, "grass": GRASS_GREEN, "mud": MUD_BROWN, "water": WATER_BLUE}
+GROUNDS = list(GROUND_COLORS)
+# Ground shown for each terrain cost on maps with costs; plain maps are all grass.
+GROUND_OF_COST = ["road" if c <= ROAD else "grass" if c <= GRASS else "mud" if c <= MUD else "water" for c in range(256)]
+OVERVIEW_GROUND = bytes(GROUNDS.index(ground) for ground in GROUND_OF_COST)
 GAME_STATES = {
     'MENU': 0,
     'PLAYING': 1,
@@ -63,221 +95,325 @@ GAME_STATES = {
     'RUNNING_ASTAR': 4
 }
 
-class Player:
-    def __init__(self, start_node):
-        self.current_node = start_node
-        self.path = [start_node]
-        self.score = 0
-        self.moves = 0
-        self.start_time = time.time()
-        self.pos = [start_node.x + GRID_OFFSET_X + GAP // 2, start_node.y + GRID_OFFSET_Y + GAP // 2]
-        self.target_pos = self.pos.copy()
-        self.moving = False
-
-    def move_to(self, new_node):
-        if new_node in self.current_node.neighbors and not self.moving:
-            self.current_node = new_node
-            self.path.append(new_node)
-            self.moves += 1
-            self.target_pos = [new_node.x + GRID_OFFSET_X + GAP // 2, new_node.y + GRID_OFFSET_Y + GAP // 2]
-            self.moving = True
-            return True
-        return False
+class Camera:
+    # Maps board cells to window pixels inside ``viewport``. ``cell`` is the
+    # zoom in pixels per cell, a fraction when zoomed far out. (x, y) is the
+    # board pixel at the viewport's top-left corner. Boards smaller than the
+    # viewport are centred.
+    def __init__(self, grid, viewport=BOARD_RECT):
+        self.grid = grid
+        self.viewport = pygame.Rect(viewport)
+        fit = min(self.viewport.width / grid.cols, self.viewport.height / grid.rows)
+        fit = int(fit) if fit >= 1 else 0.5 ** math.ceil(math.log2(1 / fit))
+        self.levels = sorted(set(ZOOM_LEVELS) | {fit})
+        self.cell = fit
+        self.x = 0
+        self.y = 0
+        self.following = True
+        self.clamp()
 
-    def update(self):
-        if self.moving:
-            dx = self.target_pos[0] - self.pos[0]
-            dy = self.target_pos[1] - self.pos[1]
-            dist = math.sqrt(dx**2 + dy**2) 
-            if dist > 1:
-                speed = PLAYER_SPEED
-                self.pos[0] += dx / dist * speed
-                self.pos[1] += dy / dist * speed
+    @property
+    def detailed(self):
+        return self.cell >= LOD_CELL_SIZE
+
+    def view(self):
+        return self.x, self.y, self.cell
+
+    def clamp(self):
+        width = self.grid.cols * self.cell
+        height = self.grid.rows * self.cell
+        if width <= self.viewport.width:
+            self.x = -int((self.viewport.width - width) // 2)
+        else:
+            self.x = int(min(max(self.x, 0), width - self.viewport.width))
+        if height <= self.viewport.height:
+            self.y = -int((self.viewport.height - height) // 2)
+        else:
+            self.y = int(min(max(self.y, 0), height - self.viewport.height))
+
+    def visible(self, area=None):
+        # (row0, col0, row1, col1): the half-open range of cells overlapping a
+        # window rect, by default the whole viewport.
+        area = self.viewport if area is None else area
+        cell = self.cell
+        x = self.x + area.x - self.viewport.x
+        y = self.y + area.y - self.viewport.y
+        r0 = max(int(y // cell), 0)
+        c0 = max(int(x // cell), 0)
+        r1 = min(math.ceil((y + area.height) / cell), self.grid.rows)
+        c1 = min(math.ceil((x + area.width) / cell), self.grid.cols)
+        return r0, c0, r1, c1
+
+    def to_screen(self, col, row):
+        return (round(self.viewport.x + col * self.cell - self.x),
+                round(self.viewport.y + row * self.cell - self.y))
+
+    def cell_rect(self, index):
+        row, col = self.grid.pos(index)
+        return pygame.Rect(self.to_screen(col, row), (self.cell, self.cell))
+
+    def board_rect(self):
+        return pygame.Rect(self.to_screen(0, 0), (round(self.grid.cols * self.cell), round(self.grid.rows * self.cell)))
+
+    def cell_at(self, pos):
+        # (row, col) under a window position, or None outside the viewport.
+        if not self.viewport.collidepoint(pos):
+            return None
+        col = math.floor((pos[0] - self.viewport.x + self.x) / self.cell)
+        row = math.floor((pos[1] - self.viewport.y + self.y) / self.cell)
+        return row, col
+
+    def pan(self, dx, dy):
+        self.x -= dx
+        self.y -= dy
+        self.following = False
+        self.clamp()
+
+    def zoom(self, steps, pos=None):
+        # One zoom level per step, in for steps > 0, keeping the board point
+        # under ``pos`` (default: the viewport centre) where it is.
+        level = min(max(self.levels.index(self.cell) + steps, 0), len(self.levels) - 1)
+        cell = self.levels[level]
+        if pos is None or not self.viewport.collidepoint(pos):
+            pos = self.viewport.center
+        px = pos[0] - self.viewport.x
+        py = pos[1] - self.viewport.y
+        self.x = (self.x + px) * cell / self.cell - px
+        self.y = (self.y + py) * cell / self.cell - py
+        self.cell = cell
+        self.clamp()
+
+    def follow(self, col, row):
+        # Scroll just enough to keep a board point (in cells) FOLLOW_MARGIN of
+        # the viewport away from its edges.
+        if not self.following:
+            return
+        for axis, value, size in ((0, col * self.cell, self.viewport.width), (1, row * self.cell, self.viewport.height)):
+            margin = size * FOLLOW_MARGIN
+            offset = self.x if axis == 0 else self.y
+            if value - offset < margin:
+                offset = value - margin
+            elif value - offset > size - margin:
+                offset = value - size + margin
+            if axis == 0:
+                self.x = offset
             else:
-                self.pos = self.target_pos.copy()
-                self.moving = False
+                self.y = offset
+        self.clamp()
 
-    def draw(self, win):
+class Player(sim.Player):
+    def __init__(self, grid, start):
+        super().__init__(grid, start, GAME_CLOCK)
+
+    def draw(self, win, camera):
         # Draw player's path (dashed orange lines)
         if len(self.path) > 1:
             for i in range(len(self.path) - 1):
-                start_pos = (self.path[i].x + GRID_OFFSET_X + GAP // 2,
-                             self.path[i].y + GRID_OFFSET_Y + GAP // 2)
-                end_pos = (self.path[i + 1].x + GRID_OFFSET_X + GAP // 2,
-                           self.path[i + 1].y + GRID_OFFSET_Y + GAP // 2)
+                start_pos = camera.to_screen(*cell_center(self.grid, self.path[i]))
+                end_pos = camera.to_screen(*cell_center(self.grid, self.path[i + 1]))
                 pygame.draw.line(win, ORANGE, start_pos, end_pos, 3)
-        # Draw player (purple circle)
-        pygame.draw.circle(win, PURPLE, (int(self.pos[0]), int(self.pos[1])), GAP // 2 - 5)
-
-class Node:
-    def __init__(self, row, col, width, total_rows):
-        self.row = row
-        self.col = col
-        self.x = col * width
-        self.y = row * width
-        self.color = GRASS_GREEN
-        self.neighbors = []
-        self.width = width
-        self.total_rows = total_rows
-        self.g = float("inf")
-        self.h = 0
-        self.f = 0
-        self.alpha = 255
-        self.fade_alpha = 0
-        self.fade_speed = 20
-
-    def get_pos(self):
-        return self.row, self.col
-
-    def is_closed(self): return self.color == RED
-    def is_open(self): return self.color == GREEN
-    def is_barrier(self): return self.color == TREE_GREEN
-    def is_start(self): return self.color == BLUE
-    def is_end(self): return self.color == BLUE
-
-    def reset(self): self.color = GRASS_GREEN; self.g = float("inf"); self.h = 0; self.f = 0; self.alpha = 255; self.fade_alpha = 0
-    def make_start(self): self.color = BLUE
-    def make_closed(self): self.color = RED; self.fade_alpha = 0
-    def make_open(self): self.color = GREEN; self.fade_alpha = 0
-    def make_barrier(self): self.color = TREE_GREEN
-    def make_end(self): self.color = BLUE
-    def make_path(self): self.color = YELLOW; self.fade_alpha = 0
+        self.draw_sprite(win, camera)
 
-    def update(self):
-        if self.fade_alpha < self.alpha:
-            self.fade_alpha += self.fade_speed
-            if self.fade_alpha > self.alpha:
-                self.fade_alpha = self.alpha
+    def draw_sprite(self, win, camera):
+        # Draw player (purple circle)
+        return pygame.draw.circle(win, PURPLE, camera.to_screen(*self.pos), max(int(camera.cell) // 2 - 5, 2))
 
-    def draw(self, win):
-        self.update()
-        # Draw base grass texture
-        pygame.draw.rect(win, GRASS_GREEN, (self.x + GRID_OFFSET_X, self.y + GRID_OFFSET_Y, self.width, self.width))
-        # Add noise for texture
-        for i in range(3):
-            rx = random.randint(self.x + GRID_OFFSET_X, self.x + GRID_OFFSET_X + self.width - 1)
-            ry = random.randint(self.y + GRID_OFFSET_Y, self.y + GRID_OFFSET_Y + self.width - 1)
-            pygame.draw.circle(win, (GRASS_GREEN[0] - 20, GRASS_GREEN[1] - 20, GRASS_GREEN[2]), (rx, ry), 2)
-        # Draw node state
-        if self.is_barrier():
-            pygame.draw.circle(win, TREE_GREEN, (self.x + GRID_OFFSET_X + self.width // 2, self.y + GRID_OFFSET_Y + self.width // 2), self.width // 2 - 2)
-        elif self.is_start():
-            # Draw house icon
-            pygame.draw.rect(win, BROWN, (self.x + GRID_OFFSET_X + 4, self.y + GRID_OFFSET_Y + self.width // 2, self.width - 8, self.width // 2 - 4))
-            pygame.draw.polygon(win, DARK_GREY, [
-                (self.x + GRID_OFFSET_X, self.y + GRID_OFFSET_Y + self.width // 2),
-                (self.x + GRID_OFFSET_X + self.width // 2, self.y + GRID_OFFSET_Y + 4),
-                (self.x + GRID_OFFSET_X + self.width, self.y + GRID_OFFSET_Y + self.width // 2)
-            ])
-        elif self.is_end():
-            # Draw flag icon
-            pygame.draw.line(win, DARK_GREY, (self.x + GRID_OFFSET_X + self.width // 2, self.y + GRID_OFFSET_Y + 4),
-                             (self.x + GRID_OFFSET_X + self.width // 2, self.y + GRID_OFFSET_Y + self.width - 4), 3)
-            pygame.draw.polygon(win, RED, [
-                (self.x + GRID_OFFSET_X + self.width // 2, self.y + GRID_OFFSET_Y + 4),
-                (self.x + GRID_OFFSET_X + self.width - 4, self.y + GRID_OFFSET_Y + 4),
-                (self.x + GRID_OFFSET_X + self.width // 2, self.y + GRID_OFFSET_Y + self.width // 3)
-            ])
-        elif self.color in [GREEN, RED, YELLOW]:
-            color = (*self.color[:3], int(self.fade_alpha))
-            pygame.draw.rect(win, color, (self.x + GRID_OFFSET_X + 2, self.y + GRID_OFFSET_Y + 2, self.width - 4, self.width - 4))
-
-    def update_neighbors(self, grid):
-        self.neighbors = []
-        for dr, dc in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
-            r, c = self.row + dr, self.col + dc
-            if 0 <= r < self.total_rows and 0 <= c < self.total_rows and not grid[r][c].is_barrier():
-                self.neighbors.append(grid[r][c])
-
-def h(p1, p2):
-    x1, y1 = p1
-    x2, y2 = p2
-    return abs(x1 - x2) + abs(y1 - y2)
-
-class AStar:
-    def __init__(self, grid, start, end):
+class FadeTracker:
+    def __init__(self, grid):
         self.grid = grid
-        self.start = start
-        self.end = end
-        self.count = 0
-        self.open_set = PriorityQueue()
-        self.open_set.put((0, self.count, start))
-        self.came_from = {}
-        self.start.g = 0
-        self.start.f = h(start.get_pos(), end.get_pos())
-        self.open_set_hash = {start}
-        self.visited_count = 0
-        self.path_length = 0
-        self.done = False
-        self.last_update = time.time()
-        self.path = []
-
-    def step(self):
-        if self.done or self.open_set.empty():
-            self.done = True
-            return
+        self.fade_alpha = bytearray(grid.size)
+        self.last_state = bytearray(grid.state)
 
-        current_time = time.time()
-        if current_time - self.last_update < ASTAR_ANIMATION_SPEED:
-            return
+    def settle_all(self):
+        # Jump every cell to the end of its fade, for cells changed while
+        # fading isn't shown.
+        self.last_state[:] = self.grid.state
+        self.fade_alpha[:] = self.grid.state.translate(SETTLED_ALPHA)
 
-        self.last_update = current_time
-        current = self.open_set.get()[2]
-        self.open_set_hash.remove(current)
+    def update(self, index):
+        state = self.grid.state[index]
+        if state != self.last_state[index]:
+            self.last_state[index] = state
+            self.fade_alpha[index] = 0
+        target = STATE_ALPHA.get(state, 255)
+        fade = self.fade_alpha[index]
+        if fade < target:
+            fade = min(fade + FADE_SPEED, target)
+            self.fade_alpha[index] = fade
+        return fade
 
-        if current == self.end:
-            self.path = self.reconstruct_path()
-            self.done = True
-            self.path_length = len(self.path)
-            return
+def ground_noise(color):
+    return (max(color[0] - 20, 0), max(color[1] - 20, 0), color[2])
+
+def draw_cell(win, grid, index, fade, camera):
+    fade_alpha = fade.update(index)
+    state = grid.state[index]
+    x, y, width, _ = camera.cell_rect(index)
+    # Draw base ground texture
+    color = GROUND_COLORS[ground(grid, index)]
+    pygame.draw.rect(win, color, (x, y, width, width))
+    # Add noise for texture
+    for i in range(3):
+        rx = random.randint(x, x + width - 1)
+        ry = random.randint(y, y + width - 1)
+        pygame.draw.circle(win, ground_noise(color), (rx, ry), 2)
+    draw_cell_state(win, state, x, y, width, fade_alpha)
+
+def draw_cell_state(win, state, x, y, width, fade_alpha):
+    if state == CellState.BARRIER:
+        pygame.draw.circle(win, TREE_GREEN, (x + width // 2, y + width // 2), width // 2 - 2)
+    elif state == CellState.START:
+        # Draw house icon
+        pygame.draw.rect(win, BROWN, (x + 4, y + width // 2, width - 8, width // 2 - 4))
+        pygame.draw.polygon(win, DARK_GREY, [
+            (x, y + width // 2),
+            (x + width // 2, y + 4),
+            (x + width, y + width // 2)
+        ])
+    elif state == CellState.END:
+        # Draw flag icon
+        pygame.draw.line(win, DARK_GREY, (x + width // 2, y + 4), (x + width // 2, y + width - 4), 3)
+        pygame.draw.polygon(win, RED, [
+            (x + width // 2, y + 4),
+            (x + width - 4, y + 4),
+            (x + width // 2, y + width // 3)
+        ])
+    elif state in STATE_COLORS:
+        color = (*STATE_COLORS[state], fade_alpha)
+        pygame.draw.rect(win, color, (x + 2, y + 2, width - 4, width - 4))
+
+def draw_grid_lines(win, camera, bounds=None, origin=(0, 0)):
+    r0, c0, r1, c1 = bounds or camera.visible()
+    left, top = camera.to_screen(c0, r0)
+    right, bottom = camera.to_screen(c1, r1)
+    left, right = left - origin[0], right - origin[0]
+    top, bottom = top - origin[1], bottom - origin[1]
+    for row in range(r0, r1 + 1):
+        y = camera.to_screen(0, row)[1] - origin[1]
+        pygame.draw.line(win, BROWN, (left, y), (right, y), 1)
+    for col in range(c0, c1 + 1):
+        x = camera.to_screen(col, 0)[0] - origin[0]
+        pygame.draw.line(win, BROWN, (x, top), (x, bottom), 1)
+
+def draw_border(surface, rect, width=3):
+    # Four fills: pygame.draw.rect with a width fills the whole clip rect when
+    # it is only a few pixels tall, as the strips baked after a pan are.
+    surface.fill(DARK_GREY, (rect.left, rect.top, rect.width, width))
+    surface.fill(DARK_GREY, (rect.left, rect.bottom - width, rect.width, width))
+    surface.fill(DARK_GREY, (rect.left, rect.top, width, rect.height))
+    surface.fill(DARK_GREY, (rect.right - width, rect.top, width, rect.height))
+
+def ground(grid, index):
+    return GROUND_OF_COST[grid.cost[index]] if grid.weighted else "grass"
+
+def ground_tile(grid, index):
+    # A fixed, scattered tile of the cell's ground, without storing one per cell.
+    return ground(grid, index), (index * 2654435761 >> 16) % GROUND_VARIANTS
+
+def draw_overview(surface, grid, camera, origin=(0, 0)):
+    # Zoomed-out board: one pixel per visible cell, or per every k-th cell when
+    # cells are smaller than a pixel, palette-mapped from the state layer and
+    # scaled up to the zoom. Cost follows the viewport, not the map.
+    r0, c0, r1, c1 = camera.visible()
+    if r0 >= r1 or c0 >= c1:
+        return
+    step = max(1, int(1 / camera.cell))
+    cols = grid.cols
+    size = (len(range(c0, c1, step)), len(range(r0, r1, step)))
+    scaled = (round(size[0] * step * camera.cell), round(size[1] * step * camera.cell))
+    x, y = camera.to_screen(c0, r0)
+
+    def layer(cells, palette):
+        data = b"".join(cells[row * cols + c0:row * cols + c1:step] for row in range(r0, r1, step))
+        image = pygame.image.frombuffer(data, size, "P")
+        image.set_palette(palette + [BEIGE] * (256 - len(palette)))
+        return image
+
+    image = layer(grid.state, OVERVIEW_COLORS)
+    if grid.weighted:
+        # Terrain underneath; empty cells let it show through.
+        image.set_colorkey(OVERVIEW_COLORS[CellState.EMPTY])
+        terrain = pygame.Surface(size)
+        terrain.blit(layer(grid.cost.translate(OVERVIEW_GROUND), list(GROUND_COLORS.values())), (0, 0))
+        terrain.blit(image, (0, 0))
+        image = terrain
+    surface.blit(pygame.transform.scale(image, scaled), (x - origin[0], y - origin[1]))
+
+class SurfaceCache:
+    # Surfaces keyed by what they show, rebuilt only when that changes; the
+    # least recently used are dropped past MAX_CACHED_SURFACES.
+    def __init__(self, limit=MAX_CACHED_SURFACES):
+        self.limit = limit
+        self.surfaces = {}
+
+    def get(self, key, build):
+        surface = self.surfaces.pop(key, None)
+        if surface is None:
+            surface = build()
+            if len(self.surfaces) >= self.limit:
+                del self.surfaces[next(iter(self.surfaces))]
+        self.surfaces[key] = surface
+        return surface
 
-        for neighbor in current.neighbors:
-            temp_g = current.g + 1
-            if temp_g < neighbor.g:
-                self.came_from[neighbor] = current
-                neighbor.g = temp_g
-                neighbor.h = h(neighbor.get_pos(), self.end.get_pos())
-                neighbor.f = neighbor.g + neighbor.h
-                if neighbor not in self.open_set_hash:
-                    self.count += 1
-                    self.open_set.put((neighbor.f, self.count, neighbor))
-                    self.open_set_hash.add(neighbor)
-                    neighbor.make_open()
-                    neighbor.alpha = 128
-
-        if current != self.start:
-            current.make_closed()
-            current.alpha = 128
-            self.visited_count += 1
-
-    def reconstruct_path(self):
-        path = []
-        current = self.end
-        while current in self.came_from:
-            path.append(current)
-            current = self.came_from[current]
-        path.reverse()
-        for node in path:
-            node.make_path()
-            node.alpha = 255
-        return path
-
-def make_grid(rows, width):
-    grid = []
-    gap = width // rows
-    for i in range(rows):
-        grid.append([Node(i, j, gap, rows) for j in range(rows)])
-    for row in grid:
-        for node in row:
-            if random.random() < 0.3:
-                node.make_barrier()
-    return grid
-
-def draw_grid_lines(win, rows, width):
-    gap = width // rows
-    for i in range(rows + 1):
-        pygame.draw.line(win, BROWN, (GRID_OFFSET_X, GRID_OFFSET_Y + i * gap), (GRID_OFFSET_X + width, GRID_OFFSET_Y + i * gap), 1)
-        pygame.draw.line(win, BROWN, (GRID_OFFSET_X + i * gap, GRID_OFFSET_Y), (GRID_OFFSET_X + i * gap, GRID_OFFSET_Y + width), 1)
+SURFACES = SurfaceCache()
+PROFILER = FrameProfiler(log_path=PROFILE_LOG)
+
+def render_text(font, text, color=BLACK):
+    return SURFACES.get(("text", font, text, color), lambda: font.render(text, True, color))
+
+def overlay_surface(color, alpha):
+    def build():
+        overlay = pygame.Surface((WIDTH, HEIGHT))
+        overlay.fill(color)
+        overlay.set_alpha(alpha)
+        return overlay
+    return SURFACES.get(("overlay", color, alpha), build)
+
+class TileAtlas:
+    # Every cell picture pre-drawn once per cell size into one surface: ground
+    # variants, tree, house, flag, and open/closed/path at each fade level.
+    # Board drawing is then a list of (atlas, dest, area) for Surface.blits.
+    _shared = {}
+
+    @classmethod
+    def shared(cls, size):
+        if size not in cls._shared:
+            cls._shared[size] = cls(size)
+        return cls._shared[size]
+
+    def __init__(self, size):
+        self.size = size
+        keys = [(kind, i) for kind in GROUNDS for i in range(GROUND_VARIANTS)]
+        keys += [(state, 255) for state in (CellState.BARRIER, CellState.START, CellState.END)]
+        for state, target in STATE_ALPHA.items():
+            keys += [(state, alpha) for alpha in sorted(set(range(0, target, FADE_SPEED)) | {target})]
+        self.surface = pygame.Surface((size * len(keys), size), pygame.SRCALPHA)
+        self.areas = {}
+        rng = random.Random(0)
+        for i, key in enumerate(keys):
+            area = pygame.Rect(i * size, 0, size, size)
+            self.areas[key] = area
+            self.surface.set_clip(area)
+            if key[0] in GROUND_COLORS:
+                color = GROUND_COLORS[key[0]]
+                self.surface.fill(color, area)
+                for _ in range(3):
+                    pygame.draw.circle(self.surface, ground_noise(color), (rng.randint(area.left, area.right - 1), rng.randint(0, size - 1)), 2)
+            else:
+                draw_cell_state(self.surface, key[0], area.x, 0, size, key[1])
+                if key[0] != CellState.BARRIER:
+                    # Grid lines stay on top of whatever a cell shows.
+                    pygame.draw.line(self.surface, BROWN, area.topleft, (area.right, 0), 1)
+                    pygame.draw.line(self.surface, BROWN, area.topleft, (area.left, size), 1)
+        self.surface.set_clip(None)
+        if pygame.display.get_surface():
+            self.surface = self.surface.convert_alpha()
+
+    def area(self, state, fade_alpha=255):
+        return self.areas.get((state, fade_alpha)) or self.areas[(state, STATE_ALPHA.get(state, 255))]
+
+    def ground(self, grid, index):
+        return self.areas[ground_tile(grid, index)]
 
 class Button:
     def __init__(self, x, y, width, height, text):
@@ -307,7 +443,7 @@ class Button:
         color = BUTTON_HOVER_COLOR if self.is_hovered else BUTTON_COLOR
         pygame.draw.rect(win, color, scaled_rect, border_radius=5)
         pygame.draw.rect(win, DARK_GREY, scaled_rect, 2, border_radius=5)
-        text_surface = FONT.render(self.text, True, BUTTON_TEXT_COLOR)
+        text_surface = render_text(FONT, self.text, BUTTON_TEXT_COLOR)
         text_rect = text_surface.get_rect(center=scaled_rect.center)
         win.blit(text_surface, text_rect)
 
@@ -324,8 +460,18 @@ class Button:
 class UI:
     def __init__(self):
         self.buttons = {}
+        self.algorithm = DEFAULT_ALGORITHM
         self._create_buttons()
 
+    @property
+    def algorithm_label(self):
+        return SOLVERS[self.algorithm].label
+
+    def cycle_algorithm(self):
+        names = solver_names()
+        self.algorithm = names[(names.index(self.algorithm) + 1) % len(names)]
+        self.buttons['game'][1].text = f"Run {self.algorithm_label}"
+
     def _create_buttons(self):
         self.buttons['menu'] = [
             Button(WIDTH//2 - BUTTON_WIDTH//2, HEIGHT//2, BUTTON_WIDTH, BUTTON_HEIGHT, "Start Game"),
@@ -333,7 +479,8 @@ class UI:
         ]
         self.buttons['game'] = [
             Button(WIDTH - BUTTON_WIDTH - 10, HEIGHT - BUTTON_HEIGHT - 10, BUTTON_WIDTH, BUTTON_HEIGHT, "Reset"),
-            Button(10, HEIGHT - BUTTON_HEIGHT - 10, BUTTON_WIDTH, BUTTON_HEIGHT, "Run A*")
+            Button(10, HEIGHT - BUTTON_HEIGHT - 10, BUTTON_WIDTH, BUTTON_HEIGHT, f"Run {self.algorithm_label}"),
+            Button(WIDTH//2 - BUTTON_WIDTH//2, HEIGHT - BUTTON_HEIGHT - 10, BUTTON_WIDTH, BUTTON_HEIGHT, "Next Algorithm")
         ]
         self.buttons['end'] = [
             Button(WIDTH//2 - BUTTON_WIDTH//2, HEIGHT//2 + 100, BUTTON_WIDTH, BUTTON_HEIGHT, "Play Again"),
@@ -343,47 +490,41 @@ class UI:
 def draw_menu(win, ui):
     win.fill(BEIGE)
     pygame.draw.rect(win, DARK_GREY, (0, 0, WIDTH, HEIGHT), 5)  # Border
-    title = TITLE_FONT.render("Path Hunter", True, BLACK)
-    subtitle = FONT.render("Race Against A* Pathfinding!", True, BLACK)
+    title = render_text(TITLE_FONT, "Path Hunter")
+    subtitle = render_text(FONT, "Race Against A* Pathfinding!")
     win.blit(title, (WIDTH//2 - title.get_width()//2, HEIGHT//3))
     win.blit(subtitle, (WIDTH//2 - subtitle.get_width()//2, HEIGHT//3 + 50))
     for button in ui.buttons['menu']:
         button.draw(win)
 
-def draw_game_ui(win, game_state, player, astar, message, ui):
+def draw_game_ui(win, game_state, player, playback, message, ui):
     pygame.draw.rect(win, LIGHT_BLUE, (0, HEIGHT - 50, WIDTH, 50))
     pygame.draw.line(win, DARK_GREY, (0, HEIGHT - 50), (WIDTH, HEIGHT - 50), 2)
     status = message
     if game_state == GAME_STATES['PLAYING'] and player:
-        status = f"Moves: {player.moves} | Time: {int(time.time() - player.start_time)}s"
-    elif game_state == GAME_STATES['RUNNING_ASTAR'] and astar:
-        status = f"Running A*: Visited={astar.visited_count}"
-    text = FONT.render(status, True, BLACK)
+        status = f"Moves: {player.moves} | Time: {int(player.elapsed())}s"
+    elif game_state == GAME_STATES['RUNNING_ASTAR'] and playback:
+        status = f"Running {ui.algorithm_label}: Visited={playback.visited_count} (Space to skip)"
+    text = render_text(FONT, status)
     win.blit(text, (10, HEIGHT - 35))
     for button in ui.buttons['game']:
         button.draw(win)
 
 def draw_game_over(win, player, optimal_path_length, ui):
-    overlay = pygame.Surface((WIDTH, HEIGHT))
-    overlay.fill(BEIGE)
-    overlay.set_alpha(230)
-    win.blit(overlay, (0, 0))
-    text = TITLE_FONT.render("Game Over!", True, BLACK)
-    subtext = FONT.render("No valid path exists!", True, BLACK)
+    win.blit(overlay_surface(BEIGE, 230), (0, 0))
+    text = render_text(TITLE_FONT, "Game Over!")
+    subtext = render_text(FONT, "No valid path exists!")
     win.blit(text, (WIDTH//2 - text.get_width()//2, HEIGHT//3))
     win.blit(subtext, (WIDTH//2 - subtext.get_width()//2, HEIGHT//3 + 50))
     for button in ui.buttons['end']:
         button.draw(win)
 
 def draw_victory(win, player, optimal_path_length, ui):
-    overlay = pygame.Surface((WIDTH, HEIGHT))
-    overlay.fill(BEIGE)
-    overlay.set_alpha(230)
-    win.blit(overlay, (0, 0))
-    title = TITLE_FONT.render("Victory!", True, BLACK)
-    score_text = FONT.render(f"Score: {player.score}", True, BLACK)
-    moves_text = FONT.render(f"Your moves: {player.moves} | Optimal: {optimal_path_length}", True, BLACK)
-    time_text = FONT.render(f"Time: {int(time.time() - player.start_time)}s", True, BLACK)
+    win.blit(overlay_surface(BEIGE, 230), (0, 0))
+    title = render_text(TITLE_FONT, "Victory!")
+    score_text = render_text(FONT, f"Score: {player.score}")
+    moves_text = render_text(FONT, f"Your moves: {player.moves} | Optimal: {optimal_path_length}")
+    time_text = render_text(FONT, f"Time: {int(player.elapsed())}s")
     win.blit(title, (WIDTH//2 - title.get_width()//2, HEIGHT//3))
     win.blit(score_text, (WIDTH//2 - score_text.get_width()//2, HEIGHT//3 + 50))
     win.blit(moves_text, (WIDTH//2 - moves_text.get_width()//2, HEIGHT//3 + 80))
@@ -391,79 +532,454 @@ def draw_victory(win, player, optimal_path_length, ui):
     for button in ui.buttons['end']:
         button.draw(win)
 
-def render(win, game_state, grid, player, astar, ui, message, optimal_path_length):
+def render(win, game_state, grid, fade, camera, player, playback, ui, message, optimal_path_length):
     win.fill(BEIGE)  # Parchment background
     pygame.draw.rect(win, DARK_GREY, (0, 0, WIDTH, HEIGHT), 5)  # Border
     if game_state != GAME_STATES['MENU']:
-        for row in grid:
-            for node in row:
-                node.draw(win)
-        draw_grid_lines(win, ROWS, WIDTH)
-        pygame.draw.rect(win, DARK_GREY, (GRID_OFFSET_X, GRID_OFFSET_Y, WIDTH, WIDTH), 3)
+        win.set_clip(camera.viewport)
+        if camera.detailed:
+            r0, c0, r1, c1 = camera.visible()
+            with PROFILER.section("render.nodes"):
+                for row in range(r0, r1):
+                    for col in range(c0, c1):
+                        draw_cell(win, grid, grid.index(row, col), fade, camera)
+            with PROFILER.section("render.grid_lines"):
+                draw_grid_lines(win, camera)
+        else:
+            with PROFILER.section("render.overview"):
+                draw_overview(win, grid, camera)
+        pygame.draw.rect(win, DARK_GREY, camera.board_rect(), 3)
         if player:
-            player.draw(win)
-        draw_game_ui(win, game_state, player, astar, message, ui)
+            player.draw(win, camera)
+        win.set_clip(None)
+        with PROFILER.section("render.ui"):
+            draw_game_ui(win, game_state, player, playback, message, ui)
+            if game_state == GAME_STATES['GAME_OVER']:
+                draw_game_over(win, player, optimal_path_length, ui)
+            elif game_state == GAME_STATES['VICTORY']:
+                draw_victory(win, player, optimal_path_length, ui)
+        if PROFILER.enabled:
+            draw_hud(win)
+    else:
+        draw_menu(win, ui)
+    with PROFILER.section("render.present"):
+        pygame.display.flip()
+
+class BoardRenderer:
+    # Draws the part of the board the camera shows. Grass, grid lines and
+    # trees for the visible cells are baked into a viewport-sized background
+    # whenever the view moves. Each frame only visible cells that changed state
+    # or are still fading are redrawn onto the board surface, from TileAtlas
+    # tiles in one Surface.blits call, and only their rects go to the display.
+    # Zoomed out below LOD_CELL_SIZE the board is a scaled overview image,
+    # drawn straight onto the window every frame, as render() does.
+    def __init__(self, grid, camera):
+        self.grid = grid
+        self.camera = camera
+        self.fade = FadeTracker(grid)
+        self.atlas = None
+        self.offset = camera.viewport.topleft
+        self.background = pygame.Surface(camera.viewport.size)
+        self.board = pygame.Surface(camera.viewport.size)
+        self.board_rect = camera.viewport.copy()
+        self.baked_barrier = bytearray(grid.barrier)
+        self.baked_view = None
+        self.view = None
+        self.fading = set()
+        self.trail = {}
+        self.player = None
+        self.trail_length = 0
+        self.sprite_rect = None
+        self.full_redraw = True
+        self.unsettled = False  # cells changed in the overview, whose fades are settled on the way back
+        grid.changed = set()
+
+    def cell_rect(self, index):
+        return self.camera.cell_rect(index).move(-self.offset[0], -self.offset[1])
+
+    def border_rect(self):
+        return self.camera.board_rect().move(-self.offset[0], -self.offset[1])
+
+    def _visible_cells(self, bounds=None):
+        r0, c0, r1, c1 = bounds or self.camera.visible()
+        cols = self.grid.cols
+        return [row * cols + col for row in range(r0, r1) for col in range(c0, c1)]
+
+    def _bake(self):
+        # A pan at the same zoom scrolls what is already baked and bakes only
+        # the strips that came into view.
+        camera = self.camera
+        old = self.baked_view
+        view = self.baked_view = camera.view()
+        width, height = self.background.get_size()
+        dx, dy = (old[0] - view[0], old[1] - view[1]) if old else (width, height)
+        if old and old[2] == view[2] and abs(dx) < width and abs(dy) < height:
+            self.background.scroll(dx, dy)
+            areas = []
+            if dx:
+                areas.append(pygame.Rect(0 if dx > 0 else width + dx, 0, abs(dx), height))
+            if dy:
+                areas.append(pygame.Rect(0, 0 if dy > 0 else height + dy, width, abs(dy)))
+        else:
+            self.atlas = TileAtlas.shared(camera.cell)
+            self.baked_barrier[:] = self.grid.barrier
+            areas = [self.background.get_rect()]
+        for area in areas:
+            self._bake_area(area)
+
+    def _bake_area(self, area):
+        atlas = self.atlas
+        bounds = self.camera.visible(area.move(self.offset))
+        cells = self._visible_cells(bounds)
+        grid = self.grid
+        barrier = grid.barrier
+        tree = atlas.area(CellState.BARRIER)
+        self.background.set_clip(area)
+        self.background.fill(BEIGE)
+        blits = [(atlas.surface, self.cell_rect(index), atlas.ground(grid, index)) for index in cells]
+        blits += [(atlas.surface, self.cell_rect(index), tree) for index in cells if barrier[index]]
+        self.background.blits(blits, doreturn=False)
+        self.background.set_clip(area.clip(self.border_rect()))
+        draw_grid_lines(self.background, self.camera, bounds, self.offset)
+        self.background.set_clip(area)
+        draw_border(self.background, self.border_rect())
+        self.background.set_clip(None)
+
+    def _draw_edges(self, surface, rect):
+        # Grid lines and the board border sit on top of everything in a cell.
+        surface.set_clip(rect)
+        pygame.draw.line(surface, BROWN, rect.topleft, (rect.right, rect.top), 1)
+        pygame.draw.line(surface, BROWN, rect.topleft, (rect.left, rect.bottom), 1)
+        draw_border(surface, self.border_rect())
+        surface.set_clip(None)
+
+    def _rebake_cell(self, index, rect):
+        self.background.blit(self.atlas.surface, rect, self.atlas.ground(self.grid, index))
+        if self.grid.barrier[index]:
+            self.background.blit(self.atlas.surface, rect, self.atlas.area(CellState.BARRIER))
+        self._draw_edges(self.background, rect)
+        self.baked_barrier[index] = self.grid.barrier[index]
+
+    def _cell_blits(self, index, blits):
+        rect = self.cell_rect(index)
+        if self.baked_barrier[index] != self.grid.barrier[index]:
+            self._rebake_cell(index, rect)
+        blits.append((self.background, rect, rect))
+        state = self.grid.state[index]
+        if state != CellState.BARRIER and state != CellState.EMPTY:
+            blits.append((self.atlas.surface, rect, self.atlas.area(state, self.fade.fade_alpha[index])))
+        return rect
+
+    def _draw_cells(self, cells, blits):
+        self.board.blits(blits, doreturn=False)
+        # Tiles at the board edge cover part of the border; the player trail
+        # goes over the tiles.
+        draw_border(self.board, self.border_rect())
+        for index in cells:
+            if index in self.trail:
+                self.board.set_clip(self.cell_rect(index))
+                for a, b in self.trail[index]:
+                    pygame.draw.line(self.board, ORANGE, self.cell_center(a), self.cell_center(b), 3)
+                self.board.set_clip(None)
+
+    def cell_center(self, index):
+        x, y = self.camera.to_screen(*cell_center(self.grid, index))
+        return x - self.offset[0], y - self.offset[1]
+
+    def _track_player(self, player, dirty):
+        if player is not self.player:
+            dirty.update(self.trail)
+            self.trail = {}
+            self.player = player
+            self.trail_length = 0
+        if not player:
+            return
+        path = player.path
+        for k in range(max(self.trail_length, 1), len(path)):
+            segment = (path[k - 1], path[k])
+            for index in segment:
+                self.trail.setdefault(index, []).append(segment)
+                dirty.add(index)
+        self.trail_length = len(path)
+
+    def invalidate(self):
+        self.full_redraw = True
+
+    def restore(self, win, rect):
+        if not self.camera.detailed:
+            return  # the overview is redrawn onto the window every frame
+        area = rect.clip(self.board_rect)
+        if area:
+            win.blit(self.board, area, area.move(-self.offset[0], -self.offset[1]))
+
+    def _on_screen(self, index, bounds):
+        row, col = divmod(index, self.grid.cols)
+        return bounds[0] <= row < bounds[2] and bounds[1] <= col < bounds[3]
+
+    def _draw_detail(self, win, cells):
+        blits = []
+        bounds = self.camera.visible()
+        if len(cells) > (bounds[2] - bounds[0]) * (bounds[3] - bounds[1]):
+            self.full_redraw = True  # more changes than cells on screen: one full redraw is cheaper
+        if self.full_redraw:
+            if self.baked_view != self.view:
+                with PROFILER.section("render.background"):
+                    self._bake()
+            blits.append((self.background, (0, 0)))
+            cells = set(cells)
+            cells.update(index for index in self._visible_cells()
+                         if self.grid.state[index] > CellState.BARRIER or index in self.trail)
+        with PROFILER.section("render.nodes"):
+            cells = [index for index in cells if self._on_screen(index, bounds)]
+            rects = [self._cell_blits(index, blits) for index in cells]
+            self._draw_cells(cells, blits)
+        if self.full_redraw:
+            win.blit(self.board, self.offset)
+            return [self.board_rect.copy()]
+        area = self.board.get_rect()
+        rects = [rect.clip(area) for rect in rects]
+        win.blits([(self.board, rect.move(self.offset), rect) for rect in rects], doreturn=False)
+        return [rect.move(self.offset) for rect in rects]
+
+    def _draw_overview(self, win, player):
+        # Straight onto the window: scaling the state layer up costs less than
+        # the copies through the board surface a partial update would need.
+        camera = self.camera
+        win.set_clip(self.board_rect)
+        win.fill(BEIGE)
+        draw_overview(win, self.grid, camera)
+        draw_border(win, camera.board_rect())
+        if player and len(player.path) > 1:
+            pygame.draw.lines(win, ORANGE, False, [camera.to_screen(*cell_center(self.grid, index)) for index in player.path], 2)
+        win.set_clip(None)
+        return [self.board_rect.copy()]
+
+    def draw(self, win, player):
+        dirty = self.grid.changed
+        self.grid.changed = set()
+        self._track_player(player, dirty)
+        if self.camera.view() != self.view:
+            self.view = self.camera.view()
+            self.full_redraw = True
+        if self.camera.detailed:
+            if self.unsettled:
+                # The overview shows no fades; everything changed meanwhile
+                # appears settled, as the full redraw on the way in draws it.
+                self.fade.settle_all()
+                self.fading.clear()
+                self.unsettled = False
+            self.fading |= dirty
+            cells = list(self.fading)
+            for index in cells:
+                if self.fade.update(index) >= STATE_ALPHA.get(self.grid.state[index], 0):
+                    self.fading.discard(index)
+            rects = self._draw_detail(win, cells)
+            self.full_redraw = False
+        else:
+            # Every overview frame redraws the whole view, as render() does;
+            # the board surface is left to be rebuilt on the way back in.
+            self.unsettled = True
+            self.sprite_rect = None
+            with PROFILER.section("render.overview"):
+                rects = self._draw_overview(win, player)
+            self.full_redraw = True
+        if self.sprite_rect:
+            self.restore(win, self.sprite_rect)
+            rects.append(self.sprite_rect)
+            self.sprite_rect = None
+        if player:
+            win.set_clip(self.board_rect)
+            self.sprite_rect = player.draw_sprite(win, self.camera).inflate(2, 2).clip(self.board_rect)
+            win.set_clip(None)
+            rects.append(self.sprite_rect)
+        return rects
+
+def make_renderer(grid, camera):
+    return BoardRenderer(grid, camera) if INCREMENTAL_RENDER else FadeTracker(grid)
+
+UI_RECT = pygame.Rect(0, HEIGHT - 60, WIDTH, 60)  # Button bar plus room for hover-scaled buttons
+
+def draw_hud(win):
+    # Profiler overlay (F3): frame and section times averaged over the
+    # profiler's window, and the counters of the current or last search.
+    summary = PROFILER.summary()
+    win.blit(SURFACES.get(("hud", HUD_RECT.size), lambda: overlay_panel(HUD_RECT.size, DARK_GREY, 200)), HUD_RECT)
+    if summary is None:
+        return
+    lines = [f"FPS {summary['fps']:.0f}  frame {summary['frame_ms']:.1f} ms (max {summary['max_frame_ms']:.1f})"]
+    lines += [f"  {name:<18}{ms:7.2f} ms" for name, ms in sorted(summary["ms"].items())]
+    solver = summary.get("solver")
+    if solver:
+        lines += [
+            f"{solver['algorithm']}: {solver['expansions']} expanded",
+            f"  {solver['expansions_per_sec']:,.0f} expansions/s",
+            f"  peak open {solver['peak_open']}  reopened {solver['reopened']}",
+            f"  heap push {solver['heap_pushes']}  pop {solver['heap_pops']}",
+        ]
+    for i, line in enumerate(lines):
+        win.blit(HUD_FONT.render(line, True, WHITE), (HUD_RECT.x + 8, HUD_RECT.y + 6 + i * 16))
+
+def overlay_panel(size, color, alpha):
+    panel = pygame.Surface(size)
+    panel.fill(color)
+    panel.set_alpha(alpha)
+    return panel
+
+def render_incremental(win, game_state, renderer, player, playback, ui, message, optimal_path_length):
+    if game_state == GAME_STATES['MENU']:
+        draw_menu(win, ui)
+        pygame.display.flip()
+        renderer.invalidate()
+        return
+    rects = renderer.draw(win, player)
+    renderer.restore(win, UI_RECT)
+    with PROFILER.section("render.ui"):
+        draw_game_ui(win, game_state, player, playback, message, ui)
         if game_state == GAME_STATES['GAME_OVER']:
             draw_game_over(win, player, optimal_path_length, ui)
         elif game_state == GAME_STATES['VICTORY']:
             draw_victory(win, player, optimal_path_length, ui)
-    else:
-        draw_menu(win, ui)
-    pygame.display.flip()
-
-def get_clicked_pos(pos, rows, width):
-    gap = width // rows
-    x, y = pos
-    row = (y - GRID_OFFSET_Y) // gap
-    col = (x - GRID_OFFSET_X) // gap
-    return row, col
-
-def calculate_score(player_moves, optimal_path_length, time_taken):
-    if optimal_path_length == 0:
-        return 0
-    efficiency = min(optimal_path_length / player_moves, 1.0)
-    time_bonus = max(100 - time_taken, 10)
-    return int(100 * efficiency * (time_bonus / 100))
+    if PROFILER.enabled:
+        renderer.restore(win, HUD_RECT)
+        draw_hud(win)
+        rects.append(HUD_RECT)
+    if game_state in [GAME_STATES['GAME_OVER'], GAME_STATES['VICTORY']]:
+        pygame.display.flip()
+        renderer.invalidate()
+        return
+    rects.append(UI_RECT)
+    with PROFILER.section("render.present"):
+        pygame.display.update(rects)
+
+def get_clicked_pos(pos, camera):
+    return camera.cell_at(pos) or (-1, -1)
+
+def run_search(worker, grid, start, end, algorithm, components, previous=None, cache=None):
+    # Start the search on the worker thread and return its job with a player
+    # that animates the trace as it streams in; the job's solver is ready once
+    # job.poll() is true. An incremental solver for the same query is
+    # replanned, not rebuilt, a query the component index rules out is
+    # answered without searching, and a query already in ``cache`` only
+    # replays its path.
+    grid.clear_search()
+    reuse = previous and previous.incremental and previous.name == algorithm and (previous.start, previous.end) == (start, end)
+    if previous and not reuse:
+        previous.detach()
+
+    def create(trace):
+        if reuse:
+            previous.visualizer = trace
+            return previous
+        return create_solver(algorithm, grid, start, end, trace)
+
+    cached = cache.get(start, end, algorithm) if cache is not None else None
+    job = worker.submit(create, cached, reject=not components.reachable(start, end), solver=previous if reuse else None)
+    return job, TracePlayer(job.trace, grid, ASTAR_PLAYBACK_EXPANSIONS, ASTAR_PLAYBACK_BUDGET)
+
+def new_board():
+    # The saved map from the command line if there is one, else a fresh random
+    # map whose seed is kept so it can be saved and regenerated. A saved map is
+    # read into memory whole: the renderer and the solvers work on a Grid.
+    if MAP_PATH:
+        with MapFile(MAP_PATH) as map_file:
+            return map_file.to_grid(), map_file.start, map_file.end, map_file.seed
+    seed = random.randrange(2 ** 31)
+    return make_grid(ROWS, seed=seed, terrain=TERRAIN_MAPS), None, None, seed
+
+def load_board(search=None):
+    # A new board and everything built per board: the view, the reachability
+    # index, the path cache and the player when the start is already known.
+    # A search still running on the old board is cancelled.
+    if search:
+        search.cancel()
+    grid, start, end, seed = new_board()
+    camera = Camera(grid)
+    player = Player(grid, start) if start is not None else None
+    return grid, start, end, seed, camera, make_renderer(grid, camera), ComponentIndex(grid), PathCache(grid), player
+
+def board_message(start, end):
+    if start is None:
+        return "Select Start Point"
+    if end is None:
+        return "Select End Point"
+    return "Use Arrow Keys to Move!"
 
 def main(win, width):
-    grid = make_grid(ROWS, width)
-    start = None
-    end = None
-    player = None
+    grid, start, end, seed, camera, renderer, components, cache, player = load_board()
     astar = None
+    playback = None
+    worker = SearchWorker()
+    search = None
+    play_time = 0
     game_state = GAME_STATES['MENU']
     optimal_path_length = 0
     run = True
     ui = UI()
     message = ""
-    last_click = 0
     click_delay = 0.2
+    last_click = -click_delay
+    unticked = 0.0  # real time not yet run as game ticks
 
     while run:
-        CLOCK.tick(FPS)
+        # Game time follows the wall clock in fixed steps, however long the
+        # frame took, so a low frame rate neither slows the player nor the score.
+        unticked = min(unticked + CLOCK.tick(FPS) / 1000, MAX_CATCH_UP)
+        PROFILER.begin_frame()
+        while unticked >= FIXED_DT:
+            unticked -= FIXED_DT
+            GAME_CLOCK.tick()
+            if player:
+                player.update()
         if player:
-            player.update()
-        if astar and game_state == GAME_STATES['RUNNING_ASTAR']:
-            astar.step()
-            if astar.done:
-                optimal_path_length = astar.path_length
+            camera.follow(*player.pos)
+        PROFILER.lap("player.update")
+        if search and search.poll():
+            astar = search.solver
+            search = None
+            optimal_path_length = astar.path_length
+            cache.put(start, end, astar.path, ui.algorithm)
+            player.score = calculate_score(player.moves, optimal_path_length, play_time)
+        if playback and game_state == GAME_STATES['RUNNING_ASTAR']:
+            playback.step()
+            if playback.done:
                 if optimal_path_length > 0:
-                    message = f"A* Done: Visited={astar.visited_count}, Path={optimal_path_length}"
+                    message = f"{ui.algorithm_label} Done: Visited={astar.visited_count}, Path={optimal_path_length}"
+                    game_state = GAME_STATES['VICTORY']
                 else:
                     message = "No Path Found"
                     game_state = GAME_STATES['GAME_OVER']
-        render(win, game_state, grid, player, astar, ui, message, optimal_path_length)
+        PROFILER.lap("astar.step")
+        if INCREMENTAL_RENDER:
+            render_incremental(win, game_state, renderer, player, playback, ui, message, optimal_path_length)
+        else:
+            render(win, game_state, grid, renderer, camera, player, playback, ui, message, optimal_path_length)
+        PROFILER.lap("render")
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 run = False
+                if search:
+                    search.cancel()
+
+            if game_state != GAME_STATES['MENU']:
+                # Wheel zooms about the cursor, right-drag pans, F follows the player again.
+                if event.type == pygame.MOUSEWHEEL:
+                    camera.zoom(event.y, pygame.mouse.get_pos())
+                elif event.type == pygame.MOUSEMOTION and event.buttons[2]:
+                    camera.pan(*event.rel)
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_f:
+                    camera.following = True
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    PROFILER.toggle()
+                    if INCREMENTAL_RENDER:
+                        renderer.invalidate()
 
             if game_state == GAME_STATES['MENU']:
                 for i, button in enumerate(ui.buttons['menu']):
                     if button.handle_event(event):
                         if i == 0:
                             game_state = GAME_STATES['PLAYING']
-                            message = "Select Start Point"
+                            message = board_message(start, end)
                         elif i == 1:
                             run = False
 
@@ -471,71 +987,90 @@ def main(win, width):
                 for i, button in enumerate(ui.buttons['game']):
                     if button.handle_event(event):
                         if i == 0:  # Reset
-                            grid = make_grid(ROWS, width)
-                            start = None
-                            end = None
-                            player = None
-                            astar = None
-                            message = "Select Start Point"
-                        elif i == 1 and start and end:  # Run A*
+                            grid, start, end, seed, camera, renderer, components, cache, player = load_board(search)
+                            search = astar = playback = None
+                            message = board_message(start, end)
+                        elif i == 1 and start is not None and end is not None:  # Run A*
                             game_state = GAME_STATES['RUNNING_ASTAR']
-                            astar = AStar(grid, start, end)
+                            search, playback = run_search(worker, grid, start, end, ui.algorithm, components, astar, cache)
+                            astar = None
+                            play_time = player.elapsed()
+                        elif i == 2:  # Next Algorithm
+                            ui.cycle_algorithm()
 
-                if event.type == pygame.MOUSEBUTTONDOWN and time.time() - last_click > click_delay:
-                    last_click = time.time()
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and GAME_CLOCK.time() - last_click > click_delay:
+                    last_click = GAME_CLOCK.time()
                     pos = event.pos
-                    row, col = get_clicked_pos(pos, ROWS, width)
-                    if 0 <= row < ROWS and 0 <= col < ROWS:
-                        node = grid[row][col]
-                        if not start and node != end:
-                            start = node
-                            start.make_start()
-                            player = Player(start)
+                    row, col = get_clicked_pos(pos, camera)
+                    if grid.in_bounds(row, col):
+                        cell = grid.index(row, col)
+                        if start is None and cell != end:
+                            start = cell
+                            grid.make_start(start)
+                            player = Player(grid, start)
                             message = "Select End Point"
-                        elif not end and node != start:
-                            end = node
-                            end.make_end()
-                            for row in grid:
-                                for spot in row:
-                                    spot.update_neighbors(grid)
+                        elif end is None and cell != start:
+                            end = cell
+                            grid.make_end(end)
                             message = "Use Arrow Keys to Move!"
-                        elif node != end and node != start:
-                            node.make_barrier()
+                        elif cell != end and cell != start:
+                            grid.make_barrier(cell)
 
-                if event.type == pygame.KEYDOWN and player and end:
-                    row, col = player.current_node.get_pos()
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_s:
+                    save_grid(SAVE_PATH, grid, start, end, seed)
+                    message = f"Map saved to {SAVE_PATH}"
+
+                if event.type == pygame.KEYDOWN and player and end is not None:
+                    row, col = grid.pos(player.current_cell)
                     moved = False
                     if event.key == pygame.K_LEFT and col > 0:
-                        moved = player.move_to(grid[row][col-1])
-                    elif event.key == pygame.K_RIGHT and col < ROWS-1:
-                        moved = player.move_to(grid[row][col+1])
+                        moved = player.move_to(grid.index(row, col-1))
+                    elif event.key == pygame.K_RIGHT and col < grid.cols-1:
+                        moved = player.move_to(grid.index(row, col+1))
                     elif event.key == pygame.K_UP and row > 0:
-                        moved = player.move_to(grid[row-1][col])
-                    elif event.key == pygame.K_DOWN and row < ROWS-1:
-                        moved = player.move_to(grid[row+1][col])
-                    if moved and player.current_node == end:
-                        astar = AStar(grid, start, end)
+                        moved = player.move_to(grid.index(row-1, col))
+                    elif event.key == pygame.K_DOWN and row < grid.rows-1:
+                        moved = player.move_to(grid.index(row+1, col))
+                    if moved:
+                        camera.following = True
+                    if moved and player.current_cell == end:
+                        search, playback = run_search(worker, grid, start, end, ui.algorithm, components, astar, cache)
+                        astar = None
+                        play_time = player.elapsed()
                         game_state = GAME_STATES['RUNNING_ASTAR']
 
+            elif game_state == GAME_STATES['RUNNING_ASTAR']:
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE and playback:
+                    playback.skip_to_end()
+                for i, button in enumerate(ui.buttons['game']):
+                    if button.handle_event(event) and i == 0:  # Reset cancels the search
+                        grid, start, end, seed, camera, renderer, components, cache, player = load_board(search)
+                        search = astar = playback = None
+                        game_state = GAME_STATES['PLAYING']
+                        message = board_message(start, end)
+
             elif game_state in [GAME_STATES['VICTORY'], GAME_STATES['GAME_OVER']]:
                 for i, button in enumerate(ui.buttons['end']):
                     if button.handle_event(event):
                         if i == 0:  # Play Again
-                            grid = make_grid(ROWS, width)
-                            start = None
-                            end = None
-                            player = None
-                            astar = None
+                            grid, start, end, seed, camera, renderer, components, cache, player = load_board(search)
+                            search = astar = playback = None
                             game_state = GAME_STATES['PLAYING']
-                            message = "Select Start Point"
+                            message = board_message(start, end)
                         elif i == 1:  # Main Menu
+                            if search:
+                                search.cancel()
+                                search = None
                             game_state = GAME_STATES['MENU']
+        PROFILER.lap("events")
+        if PROFILER.enabled:
+            solver = search.solver if search else astar
+            PROFILER.end_frame(fps=CLOCK.get_fps(), solver=solver.stats() if solver else None)
 
-        if game_state == GAME_STATES['RUNNING_ASTAR'] and astar and astar.done and astar.path_length > 0:
-            player.score = calculate_score(player.moves, astar.path_length, time.time() - player.start_time)
-            game_state = GAME_STATES['VICTORY']
-
+    worker.close()
+    PROFILER.close()
     pygame.quit()
 
 if __name__ == "__main__":
+    MAP_PATH = sys.argv[1] if len(sys.argv) > 1 else None
     main(WIN, WIDTH)
\ No newline at end of file